@@ -1,13 +1,41 @@
 import sqlite3
+import atexit
+import collections
 import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
 logger = logging.getLogger(__name__)
 
+# orjson(Rust 구현)은 stdlib json 대비 dumps ~5-6x, loads ~2x 빠르다.
+# 미설치 환경에서는 stdlib json으로 폴백한다.
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any) -> str:
+        # SQLite TEXT 컬럼에 저장하므로 bytes를 str로 디코딩
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode()
+
+    def _loads(data: str) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+    def _loads(data: str) -> Any:
+        return json.loads(data)
+
 class ValidationStatus(Enum):
     """검증 상태 열거형"""
     SUCCESS = "success"
@@ -54,239 +82,571 @@ class ChangeLog:
 class DatabaseValidationLogger:
     """데이터베이스 검증 및 갱신 로그 관리자"""
     
-    def __init__(self, db_path: str = "validation_logs.db"):
+    # WAL/페이지 크기 등은 DB 파일에 지속되지만, synchronous/cache 관련 설정은
+    # 연결(connection) 단위이므로 모든 연결에서 다시 적용해야 한다.
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA journal_size_limit=6144000",
+        "PRAGMA cache_size=-16000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    )
+
+    # timestamp는 ISO-8601 TEXT(~27바이트 + 행마다 fromisoformat 파싱) 대신
+    # INTEGER µs epoch(8바이트, 숫자 비교)로 저장한다.
+    _VALIDATION_DDL = '''
+        CREATE TABLE IF NOT EXISTS validation_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            operation_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            total_nodes INTEGER NOT NULL,
+            validated_nodes INTEGER NOT NULL,
+            failed_nodes INTEGER NOT NULL,
+            error_messages TEXT,
+            metadata TEXT,
+            ai_model TEXT NOT NULL,
+            processing_time REAL NOT NULL
+        )
+    '''
+
+    _CHANGE_DDL = '''
+        CREATE TABLE IF NOT EXISTS change_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            node_id TEXT NOT NULL,
+            change_type TEXT NOT NULL,
+            old_data TEXT,
+            new_data TEXT,
+            validation_status TEXT NOT NULL,
+            error_message TEXT,
+            ai_suggestion TEXT,
+            metadata TEXT,
+            payload TEXT
+        )
+    '''
+
+    @staticmethod
+    def _to_epoch_us(ts: datetime) -> int:
+        """datetime → µs 단위 unix epoch"""
+        return int(ts.timestamp() * 1_000_000)
+
+    @staticmethod
+    def _from_epoch_us(value: int) -> datetime:
+        """µs 단위 unix epoch → datetime"""
+        return datetime.fromtimestamp(value / 1_000_000)
+
+    def __init__(self, db_path: str = "validation_logs.db", pool_size: Optional[int] = None,
+                 buffer_size: int = 0):
         self.db_path = db_path
+        # 연결 풀: 매 호출마다 connect/close를 반복하면 연결 생성과 PRAGMA 재적용,
+        # 페이지 캐시 워밍 비용이 지배적이므로 연결을 재사용한다.
+        self._pool_size = pool_size or (os.cpu_count() or 4)
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=self._pool_size)
+        self._pool_lock = threading.Lock()
+        for _ in range(self._pool_size):
+            self._pool.put(self._connect())
+        # buffer_size > 0이면 변경 로그를 메모리에 모았다가 executemany로
+        # 일괄 커밋한다 (write-behind). N건의 소규모 트랜잭션이 fsync 1회로
+        # 합쳐지는 대신, 플러시 전 프로세스가 죽으면 버퍼 내용은 유실된다.
+        self._buffer_size = buffer_size
+        self._buffer: "collections.deque[ChangeLog]" = collections.deque()
+        self._buffer_lock = threading.Lock()
+        if buffer_size > 0:
+            atexit.register(self.flush)
         self._init_database()
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """튜닝 PRAGMA가 적용된 연결 생성"""
+        # 풀에 담긴 연결은 여러 스레드가 교대로 사용하므로 check_same_thread 해제
+        # cached_statements를 넉넉히 잡아 클래스 상수로 재사용하는 SQL이
+        # 재컴파일 없이 prepared statement 캐시에 계속 남도록 한다
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=256)
+        # 컬럼명 기반 접근: 하드코딩된 위치 인덱스 제거 + 행당 바이트코드 연산 감소
+        conn.row_factory = sqlite3.Row
+        for pragma in self._CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _conn(self):
+        """풀에서 연결을 꺼내 사용 후 반환하는 컨텍스트 매니저"""
+        conn = self._pool.get()
+        broken = False
+        try:
+            yield conn
+        except BaseException:
+            # GeneratorExit 포함 — 중단된 연결은 폐기 대상으로 표시
+            broken = True
+            raise
+        finally:
+            if broken:
+                # 오류가 난 연결은 폐기하고 새 연결로 교체하여 풀 크기를 유지
+                with self._pool_lock:
+                    try:
+                        conn.close()
+                    finally:
+                        self._pool.put(self._connect())
+            else:
+                self._pool.put(conn)
+
+    def close(self):
+        """버퍼 플러시 후 풀의 모든 연결 정리"""
+        self.flush()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # 복합 인덱스: node_id/status probe 후 timestamp DESC 순서로 바로 걷게 해
+    # LIMIT에서 조기 중단 가능 (probe 후 정렬 비용 제거).
+    # 복합 인덱스로 대체된 단일 컬럼 인덱스는 제거한다. ANALYZE는 전체
+    # 인덱스 스캔이므로 여기 넣지 않고 스키마가 실제로 바뀐 때만 1회
+    # 실행한다 (_init_database) — 평상시 통계 갱신은 cleanup_old_logs의
+    # PRAGMA optimize가 맡는다.
+    _INDEX_DDL = '''
+        CREATE INDEX IF NOT EXISTS idx_validation_timestamp ON validation_logs(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_change_timestamp ON change_logs(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_change_type ON change_logs(change_type);
+        CREATE INDEX IF NOT EXISTS idx_change_node_ts ON change_logs(node_id, timestamp DESC);
+        CREATE INDEX IF NOT EXISTS idx_validation_status_ts ON validation_logs(status, timestamp DESC);
+        DROP INDEX IF EXISTS idx_change_node_id;
+        DROP INDEX IF EXISTS idx_validation_status;
+    '''
+
+    # 일 단위 집계 롤업: 통계 조회가 O(윈도우 내 행 수) 스캔 대신
+    # O(일 수) — 최대 수십 행 — 조회로 끝난다.
+    _DAILY_DDL = '''
+        CREATE TABLE IF NOT EXISTS validation_daily (
+            day TEXT PRIMARY KEY,
+            total INTEGER NOT NULL,
+            success INTEGER NOT NULL,
+            failed INTEGER NOT NULL,
+            sum_proc_time REAL NOT NULL,
+            total_nodes INTEGER NOT NULL,
+            validated_nodes INTEGER NOT NULL,
+            failed_nodes INTEGER NOT NULL
+        )
+    '''
+
+    _DAILY_UPSERT = '''
+        INSERT INTO validation_daily
+        (day, total, success, failed, sum_proc_time, total_nodes, validated_nodes, failed_nodes)
+        VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(day) DO UPDATE SET
+            total = total + 1,
+            success = success + excluded.success,
+            failed = failed + excluded.failed,
+            sum_proc_time = sum_proc_time + excluded.sum_proc_time,
+            total_nodes = total_nodes + excluded.total_nodes,
+            validated_nodes = validated_nodes + excluded.validated_nodes,
+            failed_nodes = failed_nodes + excluded.failed_nodes
+    '''
+
     def _init_database(self):
         """데이터베이스 초기화"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
-            
-            # 검증 로그 테이블 생성
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS validation_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    operation_type TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    total_nodes INTEGER NOT NULL,
-                    validated_nodes INTEGER NOT NULL,
-                    failed_nodes INTEGER NOT NULL,
-                    error_messages TEXT,
-                    metadata TEXT,
-                    ai_model TEXT NOT NULL,
-                    processing_time REAL NOT NULL
-                )
-            ''')
-            
-            # 변경 로그 테이블 생성
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS change_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    node_id TEXT NOT NULL,
-                    change_type TEXT NOT NULL,
-                    old_data TEXT,
-                    new_data TEXT,
-                    validation_status TEXT NOT NULL,
-                    error_message TEXT,
-                    ai_suggestion TEXT,
-                    metadata TEXT
-                )
-            ''')
-            
-            # 인덱스 생성
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_validation_timestamp ON validation_logs(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_validation_status ON validation_logs(status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_change_timestamp ON change_logs(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_change_node_id ON change_logs(node_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_change_type ON change_logs(change_type)')
-            
+
+            # 테이블 생성: executescript 한 번으로 DDL 왕복 최소화
+            conn.executescript(self._VALIDATION_DDL + ';' + self._CHANGE_DDL)
+
+            # 구버전 DB(ISO-8601 TEXT timestamp) 1회 마이그레이션
+            migrated = self._migrate_text_timestamps(conn)
+
+            # 구버전 change_logs에 payload 컬럼 추가 (단일 JSON blob 경로)
+            change_columns = {r[1] for r in cursor.execute('PRAGMA table_info(change_logs)')}
+            if 'payload' not in change_columns:
+                cursor.execute('ALTER TABLE change_logs ADD COLUMN payload TEXT')
+
+            # 일 단위 롤업 테이블 — 처음 생길 때 기존 로그로 백필
+            daily_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='validation_daily'"
+            ).fetchone() is not None
+            cursor.execute(self._DAILY_DDL)
+            if not daily_exists:
+                cursor.execute('''
+                    INSERT INTO validation_daily
+                    SELECT date(timestamp / 1000000, 'unixepoch', 'localtime') AS day,
+                           COUNT(*),
+                           SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END),
+                           SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END),
+                           SUM(processing_time),
+                           SUM(total_nodes),
+                           SUM(validated_nodes),
+                           SUM(failed_nodes)
+                    FROM validation_logs
+                    GROUP BY day
+                ''')
+
+            # 인덱스 생성/정리도 스크립트 한 번으로 처리
+            conn.executescript(self._INDEX_DDL)
+
+            # ANALYZE는 스키마가 실제로 바뀐 초기화에서만 — 매 생성마다
+            # 돌리면 로거 기동 비용이 로그 테이블 크기에 비례해 커진다
+            if migrated or not daily_exists:
+                conn.execute('ANALYZE')
+
             conn.commit()
-    
+
+    def _migrate_text_timestamps(self, conn: sqlite3.Connection) -> bool:
+        """TEXT(ISO-8601) timestamp 컬럼을 INTEGER(µs epoch)로 재구축하는 마이그레이션
+
+        하나라도 마이그레이션했으면 True를 반환한다 (ANALYZE 실행 판단용).
+        """
+        migrated = False
+        cursor = conn.cursor()
+        tables = {
+            'validation_logs': (self._VALIDATION_DDL,
+                                'operation_type, status, total_nodes, validated_nodes, '
+                                'failed_nodes, error_messages, metadata, ai_model, processing_time'),
+            'change_logs': (self._CHANGE_DDL,
+                            'node_id, change_type, old_data, new_data, '
+                            'validation_status, error_message, ai_suggestion, metadata'),
+        }
+
+        for table, (ddl, rest_columns) in tables.items():
+            columns = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+            ts_type = next((col['type'] for col in columns if col['name'] == 'timestamp'), None)
+            if ts_type != 'TEXT':
+                continue
+
+            logger.info("Migrating %s.timestamp from TEXT to INTEGER epoch", table)
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+            cursor.execute(ddl)
+            # 레거시 ISO 문자열은 naive 로컬 시각(datetime.now().isoformat())인데
+            # SQLite julianday는 이를 UTC로 해석해 UTC 오프셋만큼 어긋난다.
+            # 신규 행(_to_epoch_us)과 같은 규약이 되도록 파이썬에서 변환한다.
+            legacy_rows = cursor.execute(
+                f"SELECT id, timestamp, {rest_columns} FROM {table}_legacy"
+            ).fetchall()
+            converted = [
+                (row[0], self._to_epoch_us(datetime.fromisoformat(row[1])), *row[2:])
+                for row in legacy_rows
+            ]
+            placeholders = ', '.join('?' * (rest_columns.count(',') + 3))
+            cursor.executemany(
+                f"INSERT INTO {table} (id, timestamp, {rest_columns}) VALUES ({placeholders})",
+                converted
+            )
+            cursor.execute(f"DROP TABLE {table}_legacy")
+            migrated = True
+
+        return migrated
+
+
+    @staticmethod
+    def _validation_row(validation_log: ValidationLog) -> tuple:
+        """ValidationLog를 INSERT 파라미터 튜플로 변환"""
+        return (
+            DatabaseValidationLogger._to_epoch_us(validation_log.timestamp),
+            validation_log.operation_type,
+            validation_log.status.value,
+            validation_log.total_nodes,
+            validation_log.validated_nodes,
+            validation_log.failed_nodes,
+            _dumps(validation_log.error_messages),
+            _dumps(validation_log.metadata),
+            validation_log.ai_model,
+            validation_log.processing_time
+        )
+
+    @staticmethod
+    def _daily_row(validation_log: ValidationLog) -> tuple:
+        """ValidationLog를 validation_daily UPSERT 파라미터 튜플로 변환"""
+        return (
+            validation_log.timestamp.strftime('%Y-%m-%d'),
+            1 if validation_log.status is ValidationStatus.SUCCESS else 0,
+            1 if validation_log.status is ValidationStatus.FAILED else 0,
+            validation_log.processing_time,
+            validation_log.total_nodes,
+            validation_log.validated_nodes,
+            validation_log.failed_nodes
+        )
+
+    @staticmethod
+    def _change_row(change_log: ChangeLog) -> tuple:
+        """ChangeLog를 INSERT 파라미터 튜플로 변환"""
+        # old/new/metadata를 JSON 3회 대신 blob 1회로 직렬화
+        payload = _dumps({
+            'old': change_log.old_data,
+            'new': change_log.new_data,
+            'metadata': change_log.metadata,
+        })
+        return (
+            DatabaseValidationLogger._to_epoch_us(change_log.timestamp),
+            change_log.node_id,
+            change_log.change_type.value,
+            change_log.validation_status.value,
+            change_log.error_message,
+            change_log.ai_suggestion,
+            payload
+        )
+
+    _VALIDATION_INSERT = '''
+        INSERT INTO validation_logs
+        (timestamp, operation_type, status, total_nodes, validated_nodes,
+         failed_nodes, error_messages, metadata, ai_model, processing_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    _CHANGE_INSERT = '''
+        INSERT INTO change_logs
+        (timestamp, node_id, change_type,
+         validation_status, error_message, ai_suggestion, payload)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    def log_validations(self, validation_logs: List[ValidationLog]) -> int:
+        """검증 로그 일괄 저장 (단일 트랜잭션, ID 수집 없는 fire-and-forget)"""
+        if not validation_logs:
+            return 0
+
+        with self._conn() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._VALIDATION_INSERT,
+                               (self._validation_row(log) for log in validation_logs))
+            cursor.executemany(self._DAILY_UPSERT,
+                               (self._daily_row(log) for log in validation_logs))
+            conn.commit()
+
+            logger.info("%d validation log(s) saved", len(validation_logs))
+            return len(validation_logs)
+
+    def log_changes(self, change_logs: List[ChangeLog]) -> int:
+        """변경 로그 일괄 저장 (단일 트랜잭션, ID 수집 없는 fire-and-forget)"""
+        if not change_logs:
+            return 0
+
+        with self._conn() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._CHANGE_INSERT,
+                               (self._change_row(log) for log in change_logs))
+            conn.commit()
+
+            logger.info("%d change log(s) saved", len(change_logs))
+            return len(change_logs)
+
     def log_validation(self, validation_log: ValidationLog) -> int:
-        """검증 로그 저장"""
-        with sqlite3.connect(self.db_path) as conn:
+        """검증 로그 저장 (생성된 행 ID 반환)"""
+        with self._conn() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO validation_logs 
-                (timestamp, operation_type, status, total_nodes, validated_nodes, 
-                 failed_nodes, error_messages, metadata, ai_model, processing_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                validation_log.timestamp.isoformat(),
-                validation_log.operation_type,
-                validation_log.status.value,
-                validation_log.total_nodes,
-                validation_log.validated_nodes,
-                validation_log.failed_nodes,
-                json.dumps(validation_log.error_messages),
-                json.dumps(validation_log.metadata, default=str),
-                validation_log.ai_model,
-                validation_log.processing_time
-            ))
-            
-            log_id = cursor.lastrowid
+            # RETURNING: INSERT와 같은 prepared statement에서 ID를 바로 받아
+            # lastrowid 조회 왕복을 제거 (SQLite >= 3.35)
+            log_id = cursor.execute(self._VALIDATION_INSERT.rstrip() + ' RETURNING id',
+                                    self._validation_row(validation_log)).fetchone()[0]
+            cursor.execute(self._DAILY_UPSERT, self._daily_row(validation_log))
             conn.commit()
-            
-            logger.info(f"Validation log saved with ID: {log_id}")
+
+            logger.info("Validation log saved with ID: %s", log_id)
             return log_id
-    
+
+    def flush(self):
+        """write-behind 버퍼의 변경 로그를 일괄 커밋"""
+        with self._buffer_lock:
+            pending = list(self._buffer)
+            self._buffer.clear()
+        if pending:
+            self.log_changes(pending)
+
     def log_change(self, change_log: ChangeLog) -> int:
-        """변경 로그 저장"""
-        with sqlite3.connect(self.db_path) as conn:
+        """변경 로그 저장 (생성된 행 ID 반환, 버퍼 모드에서는 0)"""
+        if self._buffer_size > 0:
+            with self._buffer_lock:
+                self._buffer.append(change_log)
+                should_flush = len(self._buffer) >= self._buffer_size
+            if should_flush:
+                self.flush()
+            return 0
+
+        with self._conn() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO change_logs 
-                (timestamp, node_id, change_type, old_data, new_data, 
-                 validation_status, error_message, ai_suggestion, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                change_log.timestamp.isoformat(),
-                change_log.node_id,
-                change_log.change_type.value,
-                json.dumps(change_log.old_data, default=str) if change_log.old_data else None,
-                json.dumps(change_log.new_data, default=str) if change_log.new_data else None,
-                change_log.validation_status.value,
-                change_log.error_message,
-                change_log.ai_suggestion,
-                json.dumps(change_log.metadata, default=str)
-            ))
-            
-            log_id = cursor.lastrowid
+            log_id = cursor.execute(self._CHANGE_INSERT.rstrip() + ' RETURNING id',
+                                    self._change_row(change_log)).fetchone()[0]
             conn.commit()
-            
-            logger.info(f"Change log saved with ID: {log_id}")
+
+            logger.info("Change log saved with ID: %s", log_id)
             return log_id
     
-    def get_validation_logs(self, limit: int = 100, status: Optional[ValidationStatus] = None) -> List[ValidationLog]:
-        """검증 로그 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+    # 스트리밍 조회 시 fetchmany 배치 크기
+    _FETCH_BATCH_SIZE = 256
+
+    def iter_validation_logs(self, limit: int = 100, status: Optional[ValidationStatus] = None) -> Iterator[ValidationLog]:
+        """검증 로그 스트리밍 조회 (행 단위 생성, 전체 materialize 없음)"""
+        with self._conn() as conn:
             cursor = conn.cursor()
-            
+
             query = "SELECT * FROM validation_logs"
             params = []
-            
+
             if status:
                 query += " WHERE status = ?"
                 params.append(status.value)
-            
+
             query += " ORDER BY timestamp DESC LIMIT ?"
             params.append(limit)
-            
+
             cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            logs = []
-            for row in rows:
-                log = ValidationLog(
-                    id=row[0],
-                    timestamp=datetime.fromisoformat(row[1]),
-                    operation_type=row[2],
-                    status=ValidationStatus(row[3]),
-                    total_nodes=row[4],
-                    validated_nodes=row[5],
-                    failed_nodes=row[6],
-                    error_messages=json.loads(row[7]) if row[7] else [],
-                    metadata=json.loads(row[8]) if row[8] else {},
-                    ai_model=row[9],
-                    processing_time=row[10]
-                )
-                logs.append(log)
-            
-            return logs
-    
-    def get_change_logs(self, node_id: Optional[str] = None, limit: int = 100) -> List[ChangeLog]:
-        """변경 로그 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+
+            # Enum.__call__ 대신 값->멤버 맵 직접 조회 (행 단위 핫 루프)
+            status_map = ValidationStatus._value2member_map_
+            while True:
+                batch = cursor.fetchmany(self._FETCH_BATCH_SIZE)
+                if not batch:
+                    break
+                for row in batch:
+                    yield ValidationLog(
+                        id=row['id'],
+                        timestamp=self._from_epoch_us(row['timestamp']),
+                        operation_type=row['operation_type'],
+                        status=status_map[row['status']],
+                        total_nodes=row['total_nodes'],
+                        validated_nodes=row['validated_nodes'],
+                        failed_nodes=row['failed_nodes'],
+                        error_messages=_loads(row['error_messages']) if row['error_messages'] else [],
+                        metadata=_loads(row['metadata']) if row['metadata'] else {},
+                        ai_model=row['ai_model'],
+                        processing_time=row['processing_time']
+                    )
+
+    def get_validation_logs(self, limit: int = 100, status: Optional[ValidationStatus] = None) -> List[ValidationLog]:
+        """검증 로그 조회"""
+        return list(self.iter_validation_logs(limit=limit, status=status))
+
+    def iter_change_logs(self, node_id: Optional[str] = None, limit: int = 100) -> Iterator[ChangeLog]:
+        """변경 로그 스트리밍 조회 (행 단위 생성, 전체 materialize 없음)"""
+        with self._conn() as conn:
             cursor = conn.cursor()
-            
+
             query = "SELECT * FROM change_logs"
             params = []
-            
+
             if node_id:
                 query += " WHERE node_id = ?"
                 params.append(node_id)
-            
+
             query += " ORDER BY timestamp DESC LIMIT ?"
             params.append(limit)
-            
+
             cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            logs = []
-            for row in rows:
-                log = ChangeLog(
-                    id=row[0],
-                    timestamp=datetime.fromisoformat(row[1]),
-                    node_id=row[2],
-                    change_type=ChangeType(row[3]),
-                    old_data=json.loads(row[4]) if row[4] else None,
-                    new_data=json.loads(row[5]) if row[5] else None,
-                    validation_status=ValidationStatus(row[6]),
-                    error_message=row[7],
-                    ai_suggestion=row[8],
-                    metadata=json.loads(row[9]) if row[9] else {}
-                )
-                logs.append(log)
-            
-            return logs
+
+            # Enum.__call__ 대신 값->멤버 맵 직접 조회 (행 단위 핫 루프)
+            status_map = ValidationStatus._value2member_map_
+            change_map = ChangeType._value2member_map_
+            while True:
+                batch = cursor.fetchmany(self._FETCH_BATCH_SIZE)
+                if not batch:
+                    break
+                for row in batch:
+                    if row['payload'] is not None:
+                        # 신버전 행: blob 1회 파싱으로 old/new/metadata 복원
+                        payload = _loads(row['payload'])
+                        old_data = payload.get('old')
+                        new_data = payload.get('new')
+                        metadata = payload.get('metadata') or {}
+                    else:
+                        # 구버전 행: 컬럼별 JSON
+                        old_data = _loads(row['old_data']) if row['old_data'] else None
+                        new_data = _loads(row['new_data']) if row['new_data'] else None
+                        metadata = _loads(row['metadata']) if row['metadata'] else {}
+                    yield ChangeLog(
+                        id=row['id'],
+                        timestamp=self._from_epoch_us(row['timestamp']),
+                        node_id=row['node_id'],
+                        change_type=change_map[row['change_type']],
+                        old_data=old_data,
+                        new_data=new_data,
+                        validation_status=status_map[row['validation_status']],
+                        error_message=row['error_message'],
+                        ai_suggestion=row['ai_suggestion'],
+                        metadata=metadata
+                    )
+
+    def get_change_logs(self, node_id: Optional[str] = None, limit: int = 100) -> List[ChangeLog]:
+        """변경 로그 조회"""
+        return list(self.iter_change_logs(node_id=node_id, limit=limit))
     
     def get_validation_stats(self, days: int = 30) -> Dict[str, Any]:
         """검증 통계 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
             
-            # 최근 N일간의 통계
+            # 최근 N일간의 통계 — 행 단위 스캔 대신 일 단위 롤업 합산
             cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_validations,
-                    SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as successful_validations,
-                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_validations,
-                    AVG(processing_time) as avg_processing_time,
+                SELECT
+                    SUM(total) as total_validations,
+                    SUM(success) as successful_validations,
+                    SUM(failed) as failed_validations,
+                    SUM(sum_proc_time) as sum_processing_time,
                     SUM(total_nodes) as total_nodes_processed,
                     SUM(validated_nodes) as total_validated_nodes,
                     SUM(failed_nodes) as total_failed_nodes
-                FROM validation_logs 
-                WHERE timestamp >= datetime('now', '-{} days')
-            '''.format(days))
-            
+                FROM validation_daily
+                WHERE day >= date('now', 'localtime', ?)
+            ''', (f'-{int(days)} days',))
+
             row = cursor.fetchone()
-            
+            total = row['total_validations'] or 0
+
             return {
-                'total_validations': row[0],
-                'successful_validations': row[1],
-                'failed_validations': row[2],
-                'avg_processing_time': row[3],
-                'total_nodes_processed': row[4],
-                'total_validated_nodes': row[5],
-                'total_failed_nodes': row[6]
+                'total_validations': total,
+                'successful_validations': row['successful_validations'],
+                'failed_validations': row['failed_validations'],
+                'avg_processing_time': (row['sum_processing_time'] / total) if total else None,
+                'total_nodes_processed': row['total_nodes_processed'],
+                'total_validated_nodes': row['total_validated_nodes'],
+                'total_failed_nodes': row['total_failed_nodes']
             }
     
+    # 정리 시 트랜잭션당 최대 삭제 행 수 (WAL 급증 방지)
+    _CLEANUP_CHUNK_SIZE = 10_000
+
     def cleanup_old_logs(self, days: int = 90):
         """오래된 로그 정리"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
-            
-            # 오래된 검증 로그 삭제
-            cursor.execute('''
-                DELETE FROM validation_logs 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
-            
-            validation_deleted = cursor.rowcount
-            
-            # 오래된 변경 로그 삭제
+
+            # 바인딩 파라미터를 사용해 SQLite의 prepared statement 캐시를 재사용
+            # (µs epoch 숫자 비교 — 행마다 datetime() 함수 호출 없음)
+            cutoff = (int(time.time()) - int(days) * 86400) * 1_000_000
+
+            # 트랜잭션 크기를 제한한 청크 삭제 — 대량 삭제 한 방에 WAL이
+            # 부풀어 오르는 것을 막는다
+            validation_deleted = 0
+            change_deleted = 0
+            for table in ('validation_logs', 'change_logs'):
+                deleted = 0
+                while True:
+                    cursor.execute(f'''
+                        DELETE FROM {table}
+                        WHERE rowid IN (
+                            SELECT rowid FROM {table}
+                            WHERE timestamp < ? LIMIT ?
+                        )
+                    ''', (cutoff, self._CLEANUP_CHUNK_SIZE))
+                    deleted += cursor.rowcount
+                    conn.commit()
+                    if cursor.rowcount < self._CLEANUP_CHUNK_SIZE:
+                        break
+                if table == 'validation_logs':
+                    validation_deleted = deleted
+                else:
+                    change_deleted = deleted
+
+            # 일 단위 롤업도 같은 컷오프로 정리 — 남겨두면 방금 삭제한
+            # 행들이 get_validation_stats 집계에 계속 잡힌다
             cursor.execute('''
-                DELETE FROM change_logs 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
-            
-            change_deleted = cursor.rowcount
-            
+                DELETE FROM validation_daily
+                WHERE day < date(? / 1000000, 'unixepoch', 'localtime')
+            ''', (cutoff,))
             conn.commit()
-            
-            logger.info(f"Cleaned up {validation_deleted} validation logs and {change_deleted} change logs older than {days} days") 
\ No newline at end of file
+
+            # WAL 파일 크기 회수 + 플래너 통계 갱신
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            conn.execute('PRAGMA optimize')
+
+            logger.info("Cleaned up %d validation logs and %d change logs older than %d days",
+                        validation_deleted, change_deleted, days) 
\ No newline at end of file
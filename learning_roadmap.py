@@ -1,40 +1,119 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
+import hashlib
+import heapq
 import base64
 import io
 import time
 import threading
 import queue
+import os
+import functools
+import copy
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from subprocess import Popen, PIPE, STDOUT
 import re
+import sys
 import html
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
-from bs4 import BeautifulSoup
+from collections import Counter, defaultdict
+from string import Template
+
+# selectolax(lexbor)는 C 레벨 파싱/탐색으로 BS4 대비 10배 이상 빠르다.
+# 미설치 환경에서는 기존 BeautifulSoup 경로로 폴백한다. plotly/bs4는
+# 실제 사용 지점에서 지연 임포트해 콜드 스타트 비용을 줄인다.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# simsimd는 SIMD 코사인 커널 제공 — 미설치 시 numpy 폴백
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# pyahocorasick: 리터럴 키워드/도구를 텍스트 1회 스캔으로 전부 찾는 오토마톤.
+# 미설치 시 기존 정규식 스캔으로 폴백.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# scikit-learn TF-IDF: 텍스트 검색 스코어링을 청크별 파이썬 루프 대신
+# 희소 행렬 곱 1회로 벡터화한다. 미설치 시 인버티드 인덱스 + Jaccard 폴백.
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+except ImportError:
+    TfidfVectorizer = None
+
+# orjson: C 구현 JSON 파서/직렬화기 — 큰 로드맵 응답 파싱과 다운로드
+# 직렬화가 stdlib json 대비 수 배 빠르다. 미설치 시 stdlib로 폴백.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def _json_loads(s: str):
+    """JSON 문자열 파싱 (orjson 우선, stdlib 폴백)"""
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+def _json_pretty(obj: Any) -> str:
+    """들여쓰기 2칸 직렬화 — 미리보기/다운로드용"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
 
 # 데이터 구조 정의
-@dataclass
+# slots: 인스턴스별 __dict__ 제거 — 청크 수천 개 기준 메모리 ~40% 절감,
+# 태그 스캔 루프의 속성 접근도 고정 오프셋으로 빨라진다
+@dataclass(slots=True)
 class RoadmapChunk:
     id: str
     roadmap_id: str
     content: str
     html_fragment: str
-    embedding: List[float]
+    # packed float32 — List[float] 대비 원소당 28B → 4B, 벡터 연산 직결
+    embedding: np.ndarray
     chunk_index: int
     metadata: Dict[str, Any]
     collection_tags: List[str]  # 수집을 위한 태그 (카테고리, 타입, 난이도 등)
     search_tags: List[str]      # 검색을 위한 태그 (키워드, 기술 스택 등)
-
-@dataclass
+    # int8 양자화 임베딩 (float32 대비 1/4 메모리, VNNI 등 정수 SIMD 활용)
+    embedding_i8: Optional[np.ndarray] = None
+    embedding_scale: float = 0.0
+    # content를 소문자 토큰 frozenset으로 캐시 — 검색마다 lower/split/set을
+    # 다시 만들지 않도록 최초 사용 시 1회만 계산 (_chunk_tokens 참조)
+    content_tokens: Optional[frozenset] = None
+    # 태그 집합 캐시 (원본 케이스 / 소문자) — 파일명 검색 경로에서 매번
+    # 리스트 연결 + lower()를 반복하지 않기 위함 (_chunk_tag_sets 참조)
+    tags_exact: Optional[frozenset] = None
+    tags_lower: Optional[frozenset] = None
+    # metadata["category"].lower() 결과 캐시 — 검색 결과 분류 루프에서
+    # dict 조회 + lower()를 반복하지 않기 위함 (_chunk_category 참조)
+    category_lower: Optional[str] = None
+    # 검색 결과 HTML에 들어가는 이스케이프 완료 섹션명/내용 미리보기 캐시
+    section_escaped: Optional[str] = None
+    preview_escaped: Optional[str] = None
+    # 표 미리보기용 100자 절단 문자열 캐시 — 미리보기 표가 리런마다
+    # 슬라이스 + 연결 문자열을 새로 만들지 않기 위함 (_chunk_preview100 참조)
+    content_preview_100: Optional[str] = None
+
+@dataclass(slots=True)
 class RoadmapDocument:
     id: str
     title: str
-    original_html: str
+    # 원본 HTML 전문 대신 해시/크기만 보관 — 세션 상태에 수 MB 업로드가
+    # 청크 html_fragment와 이중으로 상주하는 것을 방지 (식별/중복 검사용)
+    original_html_hash: str
+    original_html_size: int
     chunks: List[RoadmapChunk]
     metadata: Dict[str, Any]
 
@@ -46,8 +125,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS 스타일링
-st.markdown("""
+# CSS 스타일링 — 문자열 조립을 프로세스당 1회로 캐시하고 매 리런은 재사용
+@st.cache_resource(show_spinner=False)
+def _page_css() -> str:
+    return """
 <style>
     .main-header {
         background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%);
@@ -115,7 +196,9 @@ st.markdown("""
         font-size: 0.875rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_page_css(), unsafe_allow_html=True)
 
 # 세션 상태 초기화
 if 'roadmaps' not in st.session_state:
@@ -132,6 +215,12 @@ if 'uploaded_filenames' not in st.session_state:
     st.session_state.uploaded_filenames = []
 if 'roadmap_documents' not in st.session_state:
     st.session_state.roadmap_documents = {}
+if 'corpus_version' not in st.session_state:
+    st.session_state.corpus_version = 0
+if 'session_id' not in st.session_state:
+    # 프로세스 전역 검색 캐시 키에 섞는 세션 식별자 — corpus_version은
+    # 세션별 카운터라 이것 없이는 동시 세션끼리 캐시가 교차 적중한다
+    st.session_state.session_id = os.urandom(8).hex()
 if 'custom_tags' not in st.session_state:
     st.session_state.custom_tags = {}
 if 'tag_suggestions' not in st.session_state:
@@ -144,12 +233,130 @@ if 'tag_suggestions' not in st.session_state:
         "microservices", "serverless", "blockchain", "iot", "cloud-computing"
     ]
 
+# 임베딩 기본값 — 빈 벡터는 읽기 전용이므로 청크 간 공유해도 안전
+_EMPTY_EMBEDDING = np.empty(0, dtype=np.float32)
+
+def quantize_embedding(v: np.ndarray):
+    """float32 임베딩을 (int8 벡터, scale)로 양자화"""
+    v = np.asarray(v, dtype=np.float32)
+    if v.size == 0:
+        return np.empty(0, dtype=np.int8), 0.0
+    scale = float(np.max(np.abs(v))) / 127 or 1.0
+    return (v / scale).round().astype(np.int8), scale
+
+def dequantize_embedding(q: np.ndarray, scale: float) -> np.ndarray:
+    """양자화 임베딩 복원 (내보내기 등 float 벡터가 필요할 때만)"""
+    return np.asarray(q, dtype=np.float32) * scale
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """float32 벡터 코사인 유사도 (simsimd 있으면 SIMD 커널 사용)"""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    if a.size == 0 or b.size == 0:
+        return 0.0
+    if simsimd is not None:
+        return 1.0 - float(simsimd.cosine(a, b))
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(np.dot(a, b) / denom) if denom else 0.0
+
+def cosine_similarity_i8(a: np.ndarray, b: np.ndarray) -> float:
+    """int8 양자화 벡터 간 코사인 유사도
+
+    코사인은 벡터 스케일에 불변이므로 scale 없이 바로 비교 가능.
+    simsimd는 int8을 네이티브 지원(VNNI 디스패치), 폴백은 float32 승격.
+    """
+    a = np.asarray(a, dtype=np.int8)
+    b = np.asarray(b, dtype=np.int8)
+    if a.size == 0 or b.size == 0:
+        return 0.0
+    if simsimd is not None:
+        return 1.0 - float(simsimd.cosine(a, b))
+    return cosine_similarity(a.astype(np.float32), b.astype(np.float32))
+
+# 파싱/추출에 쓰이는 정규식은 모듈 로드 시 1회만 컴파일한다
+# (청크당 수차례 호출되는 핫 패스에서 re 캐시 조회 비용 제거)
+_TECH_KW_RE = re.compile(r'\b(JavaScript|Python|React|Node\.js|HTML|CSS|API|Database|TypeScript|Vue|Angular|Django|Flask|Express|MongoDB|PostgreSQL|MySQL|Git|Docker|AWS|Azure|GCP)\b', re.IGNORECASE)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE)
+_HEADING_RE = re.compile(r'<h[1-6][^>]*>(.*?)</h[1-6]>', re.IGNORECASE)
+_URL_RE = re.compile(r'https?://[^\s<>"]+')
+
+# 리터럴 키워드/도구 목록 (정규식 패턴과 동일 어휘)
+_KEYWORD_LITERALS = frozenset((
+    'javascript', 'python', 'react', 'node.js', 'html', 'css', 'api',
+    'database', 'typescript', 'vue', 'angular', 'django', 'flask', 'express',
+    'mongodb', 'postgresql', 'mysql', 'git', 'docker', 'aws', 'azure', 'gcp',
+))
+_TOOL_LITERALS = frozenset((
+    'vscode', 'visual studio', 'sublime', 'atom', 'webstorm', 'intellij',
+    'git', 'github', 'gitlab', 'bitbucket', 'docker', 'kubernetes', 'jenkins',
+    'travis', 'npm', 'yarn', 'webpack', 'vite', 'parcel', 'react', 'vue',
+    'angular', 'svelte', 'node.js', 'express', 'django', 'flask', 'spring',
+))
+
+if ahocorasick is not None:
+    _LITERAL_AUTOMATON = ahocorasick.Automaton()
+    for _word in _KEYWORD_LITERALS | _TOOL_LITERALS:
+        _cats = tuple(cat for cat, pool in (('keyword', _KEYWORD_LITERALS),
+                                            ('tool', _TOOL_LITERALS))
+                      if _word in pool)
+        _LITERAL_AUTOMATON.add_word(_word, (_cats, _word))
+    _LITERAL_AUTOMATON.make_automaton()
+else:
+    _LITERAL_AUTOMATON = None
+
+def _scan_literals(text: str) -> Dict[str, set]:
+    """키워드/도구 리터럴을 오토마톤 1회 패스로 모두 수집
+
+    패턴 수 × 텍스트 길이의 반복 스캔 대신 O(텍스트 + 매치 수).
+    오토마톤이 없으면 기존 union 정규식으로 폴백한다.
+    """
+    lower = text.lower()
+    buckets = {'keyword': set(), 'tool': set()}
+    if _LITERAL_AUTOMATON is None:
+        buckets['keyword'].update(kw.lower() for kw in _TECH_KW_RE.findall(text))
+        buckets['tool'].update(m.lower() for m in _ALL_TOOLS_RE.findall(lower))
+        return buckets
+    n = len(lower)
+    for end, (cats, word) in _LITERAL_AUTOMATON.iter(lower):
+        start = end - len(word) + 1
+        # \b 동치 검사 — 단어 문자에 붙은 부분 일치는 제외
+        if start > 0 and (lower[start - 1].isalnum() or lower[start - 1] == '_'):
+            continue
+        if end + 1 < n and (lower[end + 1].isalnum() or lower[end + 1] == '_'):
+            continue
+        for cat in cats:
+            buckets[cat].add(word)
+    return buckets
+
+# 도구 키워드는 단일 union 패턴으로 묶어 텍스트를 한 번만 스캔한다
+_ALL_TOOLS_RE = re.compile(
+    r'\b(vscode|visual studio|sublime|atom|webstorm|intellij'
+    r'|git|github|gitlab|bitbucket'
+    r'|docker|kubernetes|jenkins|travis'
+    r'|npm|yarn|webpack|vite|parcel'
+    r'|react|vue|angular|svelte'
+    r'|node\.js|express|django|flask|spring)\b',
+    re.IGNORECASE)
+
+_OBJECTIVE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'학습\s*목표[:\s]*([^.]*)',
+    r'목표[:\s]*([^.]*)',
+    r'이해\s*할\s*수\s*있[어야]*\s*한다?[:\s]*([^.]*)',
+    r'할\s*수\s*있[어야]*\s*한다?[:\s]*([^.]*)',
+)]
+
+# 클래스 속성 매칭용 (구조 파싱)
+_MAIN_BRANCH_CLASS_RE = re.compile(r'branch|level|main')
+_LEVEL_CLASS_RE = re.compile(r'level|branch')
+_BRANCH_CLASS_RE = re.compile(r'branch|sub')
+_SUB_CLASS_RE = re.compile(r'sub|detail')
+
 # 유틸리티 함수들
 def extract_keywords(content: str) -> List[str]:
     """컨텐츠에서 기술 키워드를 추출합니다."""
-    tech_keywords = re.findall(r'\b(JavaScript|Python|React|Node\.js|HTML|CSS|API|Database|TypeScript|Vue|Angular|Django|Flask|Express|MongoDB|PostgreSQL|MySQL|Git|Docker|AWS|Azure|GCP)\b', content, re.IGNORECASE)
-    return list(set([kw.lower() for kw in tech_keywords]))
+    return list(_scan_literals(content)['keyword'])
 
+@st.cache_data(show_spinner=False, max_entries=128)
 def extract_roadmap_metadata(html_content: str) -> Dict[str, Any]:
     """HTML에서 로드맵 메타데이터를 추출합니다."""
     metadata = {
@@ -160,7 +367,7 @@ def extract_roadmap_metadata(html_content: str) -> Dict[str, Any]:
     }
     
     # 제목 추출
-    title_match = re.search(r'<title[^>]*>(.*?)</title>', html_content, re.IGNORECASE)
+    title_match = _TITLE_RE.search(html_content)
     if title_match:
         metadata["title"] = title_match.group(1).strip()
     
@@ -176,67 +383,209 @@ def extract_roadmap_metadata(html_content: str) -> Dict[str, Any]:
     
     return metadata
 
+# 파서 독립 노드 헬퍼 — BS4 Tag와 lexbor Node를 같은 코드 경로로 다룬다
+def _is_bs4(element) -> bool:
+    return hasattr(element, 'get_text')
+
+def _node_text(element) -> str:
+    """노드 전체 텍스트"""
+    if _is_bs4(element):
+        return element.get_text()
+    return element.text(deep=True, separator=' ')
+
+def _node_html(element) -> str:
+    """노드의 HTML 문자열"""
+    if _is_bs4(element):
+        return str(element)
+    return element.html or ''
+
+def _node_classes(element) -> List[str]:
+    """노드의 class 속성 목록"""
+    if _is_bs4(element):
+        return element.get('class', []) or []
+    if element.attributes:
+        return (element.attributes.get('class') or '').split()
+    return []
+
+def _node_css(element, selector: str, class_re=None) -> list:
+    """하위 요소 검색 (class_re가 있으면 class 값 정규식 필터)"""
+    nodes = element.select(selector) if _is_bs4(element) else element.css(selector)
+    if class_re is not None:
+        nodes = [n for n in nodes
+                 if any(class_re.search(c) for c in _node_classes(n))]
+    return nodes
+
+def _node_first(element, selector: str, class_re=None):
+    """조건에 맞는 첫 하위 요소"""
+    found = _node_css(element, selector, class_re)
+    return found[0] if found else None
+
+def _node_children(element) -> list:
+    """텍스트 노드를 제외한 자식 요소 목록"""
+    if _is_bs4(element):
+        return [c for c in element.children if getattr(c, 'name', None)]
+    return list(element.iter())
+
+def _node_next_sibling(element, tags):
+    """주어진 태그 중 처음 나오는 다음 형제 요소"""
+    if _is_bs4(element):
+        return element.find_next_sibling(list(tags))
+    node = element.next
+    while node is not None:
+        if node.tag in tags:
+            return node
+        node = node.next
+    return None
+
+def _node_links(element) -> list:
+    """(url, title) 튜플 목록"""
+    if _is_bs4(element):
+        return [(a.get('href', ''), a.get_text().strip())
+                for a in element.find_all('a', href=True)]
+    return [((a.attributes.get('href') or ''),
+             a.text(deep=True, separator=' ').strip())
+            for a in element.css('a[href]')]
+
+# 구조 파싱이 실제로 탐색하는 태그 — BS4 폴백은 이 외의 노드 생성을 건너뛴다
+_STRAINER_TAGS = ['div', 'section', 'h1', 'h2', 'h3', 'p', 'a', 'title']
+
+def _parse_document(html_content: str, full: bool = False):
+    """HTML 문서 루트 반환 (lexbor 우선, BS4 폴백)
+
+    full=False면 BS4 폴백 시 SoupStrainer로 탐색 대상 태그만 트리에
+    올려 시간/메모리를 줄인다. 문서 전체 텍스트가 필요한 호출자는
+    full=True로 전체 파싱을 요청한다.
+    """
+    if LexborHTMLParser is not None:
+        root = LexborHTMLParser(html_content).root
+        if root is not None:
+            return root
+    from bs4 import BeautifulSoup, SoupStrainer  # 폴백 경로에서만 지연 임포트
+    if full:
+        return BeautifulSoup(html_content, 'lxml')
+    return BeautifulSoup(html_content, 'lxml',
+                         parse_only=SoupStrainer(_STRAINER_TAGS))
+
+@st.cache_data(show_spinner=False, max_entries=128)
 def parse_html_sections(html_content: str, roadmap_id: str) -> List[RoadmapChunk]:
-    """HTML을 의미있는 섹션으로 분할하여 청크를 생성합니다."""
+    """HTML을 의미있는 섹션으로 분할하여 청크를 생성합니다.
+
+    순수 함수이므로 st.cache_data로 캐싱 — Streamlit 리런마다 같은 업로드를
+    재파싱하지 않고 html_content 해시 키로 O(1) 재사용한다."""
+    return _parse_html_sections_impl(html_content, roadmap_id)
+
+def parse_many_html_sections(items: List[tuple]) -> List[List[RoadmapChunk]]:
+    """(html_content, roadmap_id) 목록을 병렬 파싱
+
+    파일 단위 파싱은 CPU 바운드(GIL)이므로 문서가 여럿이면 프로세스 풀로
+    코어를 채운다. 워커는 Streamlit 컨텍스트가 없으니 순수 구현을 호출하고,
+    경고/오류는 logging으로 남긴다.
+    """
+    if len(items) <= 1:
+        return [parse_html_sections(html, rid) for html, rid in items]
+    workers = min(len(items), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_one, items))
+
+def _parse_one(item: tuple) -> List[RoadmapChunk]:
+    """프로세스 풀 워커 (모듈 수준 — picklable)"""
+    return _parse_html_sections_impl(*item)
+
+def _parse_html_sections_impl(html_content: str, roadmap_id: str) -> List[RoadmapChunk]:
+    """parse_html_sections의 캐시/컨텍스트 없는 순수 구현"""
     chunks = []
     
     try:
         # 계층 구조 파싱 (레벨 > 브랜치 > 서브브랜치)
-        soup = BeautifulSoup(html_content, 'html.parser')
+        root = _parse_document(html_content)
         
         # 메인 브랜치들 찾기 (다양한 패턴 시도)
         main_branches = None
         
-        # 패턴 1: main-branches 클래스
-        main_branches = soup.find('div', class_='main-branches')
+        # 패턴 1: main-branches 클래스 (자식 요소가 각 레벨)
+        container = _node_first(root, 'div.main-branches')
+        if container is not None:
+            main_branches = _node_children(container)
         
         # 패턴 2: branch, level, main이 포함된 클래스
         if not main_branches:
-            main_branches = soup.find_all(['section', 'div'], class_=re.compile(r'branch|level|main'))
+            main_branches = _node_css(root, 'section[class], div[class]',
+                                      _MAIN_BRANCH_CLASS_RE)
         
         # 패턴 3: 특정 구조 찾기
         if not main_branches:
             # h1, h2, h3 태그를 기준으로 구조 찾기
-            headings = soup.find_all(['h1', 'h2', 'h3'])
+            headings = _node_css(root, 'h1, h2, h3')
             if headings:
                 main_branches = []
                 for heading in headings:
                     # 헤딩 다음의 div나 section을 찾기
-                    next_sibling = heading.find_next_sibling(['div', 'section'])
-                    if next_sibling:
+                    next_sibling = _node_next_sibling(heading, ('div', 'section'))
+                    if next_sibling is not None:
                         main_branches.append(next_sibling)
         
         # 패턴 4: 모든 div를 브랜치로 간주
         if not main_branches:
-            main_branches = soup.find_all('div', class_=True)
+            main_branches = _node_css(root, 'div[class]')
         
         if main_branches:
             # 구조화된 파싱
-            chunks = _parse_structured_content(roadmap_id, main_branches, soup)
+            chunks = _parse_structured_content(roadmap_id, main_branches, root)
         else:
             # 기본 섹션별 분할
-            chunks = _parse_basic_sections(roadmap_id, html_content)
+            chunks = _parse_basic_sections(roadmap_id, root)
         
         # 최소한 하나의 청크라도 생성되도록 보장
         if not chunks:
             chunks = _create_fallback_chunk(roadmap_id, html_content)
         
     except Exception as e:
-        st.error(f"파싱 중 오류 발생: {str(e)}")
+        logger.error("파싱 중 오류 발생: %s", e)
         # 오류 발생 시 기본 청크 생성
         chunks = _create_fallback_chunk(roadmap_id, html_content)
     
+    # 태그 문자열 intern — 수천 청크에 걸친 중복 태그를 싱글턴으로 접어
+    # 메모리를 줄이고 역색인/집합 비교를 포인터 비교로 만든다
+    for chunk in chunks:
+        chunk.collection_tags = [sys.intern(t) for t in chunk.collection_tags]
+        chunk.search_tags = [sys.intern(t) for t in chunk.search_tags]
+    
     return chunks
 
-def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[RoadmapChunk]:
+def _make_fallback(roadmap_id: str, suffix: str, title: str, html_fragment: str,
+                   category: str = 'unknown', chunk_type: str = 'fallback_structured',
+                   content: Optional[str] = None) -> RoadmapChunk:
+    """구조 파싱의 폴백/오류 청크 생성 (동일 형태 메타데이터 한 곳에서 조립)"""
+    return RoadmapChunk(
+        id=f"{roadmap_id}_{suffix}",
+        roadmap_id=roadmap_id,
+        content=content if content is not None else title,
+        html_fragment=html_fragment,
+        embedding=_EMPTY_EMBEDDING,
+        chunk_index=0,
+        metadata={
+            "section": title,
+            "level": 1,
+            "category": category,
+            "type": chunk_type,
+            "keywords": extract_keywords(title),
+            "tools": [],
+            "resources": [],
+            "learning_objectives": []
+        },
+        collection_tags=[category],
+        search_tags=[category]
+    )
+
+def _parse_structured_content(roadmap_id: str, main_branches, root) -> List[RoadmapChunk]:
     """구조화된 콘텐츠 파싱"""
     chunks = []
     chunk_index = 0
     
     try:
         # 제목 추출
-        title_elem = soup.find(['h1', 'title'])
-        main_title = title_elem.get_text().strip() if title_elem else "학습 로드맵"
+        title_elem = _node_first(root, 'h1, title')
+        main_title = _node_text(title_elem).strip() if title_elem is not None else "학습 로드맵"
         
         # 레벨별 파싱
         for level_idx, level_branch in enumerate(main_branches):
@@ -245,30 +594,32 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                 level_node = None
                 
                 # 패턴 1: level, branch 클래스
-                level_node = level_branch.find(['div', 'h2'], class_=re.compile(r'level|branch'))
+                level_node = _node_first(level_branch, 'div[class], h2[class]',
+                                         _LEVEL_CLASS_RE)
                 
                 # 패턴 2: 첫 번째 div나 h2
-                if not level_node:
-                    level_node = level_branch.find(['div', 'h2'])
+                if level_node is None:
+                    level_node = _node_first(level_branch, 'div, h2')
                 
                 # 패턴 3: level_branch 자체를 사용
-                if not level_node:
+                if level_node is None:
                     level_node = level_branch
                 
-                if level_node:
-                    level_title = level_node.get_text().strip()
+                if level_node is not None:
+                    level_title = _node_text(level_node).strip()
                     if not level_title:
                         level_title = f"레벨 {level_idx + 1}"
                     
-                    level_category = _extract_category_from_classes(level_node.get('class', []))
+                    level_category = _extract_category_from_classes(_node_classes(level_node))
+                    level_tools, level_resources, level_objectives, _ = _extract_all(level_branch)
                     
                     # 레벨 청크 생성
                     level_chunk = RoadmapChunk(
                         id=f"{roadmap_id}_level_{level_idx}",
                         roadmap_id=roadmap_id,
                         content=f"{level_title} - {level_category} 단계",
-                        html_fragment=str(level_branch),
-                        embedding=[],
+                        html_fragment=_node_html(level_branch),
+                        embedding=_EMPTY_EMBEDDING,
                         chunk_index=chunk_index,
                         metadata={
                             "section": level_title,
@@ -276,9 +627,9 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                             "category": level_category,
                             "type": "level",
                             "keywords": extract_keywords(level_title),
-                            "tools": _extract_tools(level_branch),
-                            "resources": _extract_resources(level_branch),
-                            "learning_objectives": _extract_learning_objectives(level_branch)
+                            "tools": level_tools,
+                            "resources": level_resources,
+                            "learning_objectives": level_objectives
                         },
                         collection_tags=[f"level-{level_category}"],
                         search_tags=[f"level-{level_category}"]
@@ -290,19 +641,21 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                     branches = []
                     
                     # 패턴 1: branch, sub 클래스
-                    branches = level_branch.find_all(['div'], class_=re.compile(r'branch|sub'))
+                    branches = _node_css(level_branch, 'div[class]',
+                                         _BRANCH_CLASS_RE)
                     
                     # 패턴 2: 모든 div
                     if not branches:
-                        branches = level_branch.find_all('div')
+                        branches = _node_css(level_branch, 'div')
                     
                     # 패턴 3: 모든 자식 요소
                     if not branches:
-                        branches = level_branch.find_all(['div', 'section', 'p'])
+                        branches = _node_css(level_branch, 'div, section, p')
                     
                     for branch_idx, branch in enumerate(branches):
                         try:
-                            branch_title = branch.get_text().strip()
+                            branch_tools, branch_resources, branch_objectives, branch_text = _extract_all(branch)
+                            branch_title = branch_text.strip()
                             if not branch_title:
                                 branch_title = f"브랜치 {branch_idx + 1}"
                             
@@ -314,8 +667,8 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                                 id=f"{roadmap_id}_branch_{level_idx}_{branch_idx}",
                                 roadmap_id=roadmap_id,
                                 content=branch_title,
-                                html_fragment=str(branch),
-                                embedding=[],
+                                html_fragment=_node_html(branch),
+                                embedding=_EMPTY_EMBEDDING,
                                 chunk_index=chunk_index,
                                 metadata={
                                     "section": branch_title,
@@ -324,9 +677,9 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                                     "category": level_category,
                                     "type": "branch",
                                     "keywords": extract_keywords(branch_title),
-                                    "tools": _extract_tools(branch),
-                                    "resources": _extract_resources(branch),
-                                    "learning_objectives": _extract_learning_objectives(branch)
+                                    "tools": branch_tools,
+                                    "resources": branch_resources,
+                                    "learning_objectives": branch_objectives
                                 },
                                 collection_tags=[f"branch-{branch_title}"],
                                 search_tags=[f"branch-{branch_title}"]
@@ -335,13 +688,15 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                             chunk_index += 1
                             
                             # 서브브랜치 파싱 (선택적)
-                            sub_branches = branch.find_all(['div'], class_=re.compile(r'sub|detail'))
+                            sub_branches = _node_css(branch, 'div[class]',
+                                                     _SUB_CLASS_RE)
                             if not sub_branches:
-                                sub_branches = branch.find_all(['div', 'p'])
+                                sub_branches = _node_css(branch, 'div, p')
                             
                             for sub_idx, sub_branch in enumerate(sub_branches[:3]):  # 최대 3개만
                                 try:
-                                    sub_title = sub_branch.get_text().strip()
+                                    sub_tools, sub_resources, sub_objectives, sub_text = _extract_all(sub_branch)
+                                    sub_title = sub_text.strip()
                                     if not sub_title or len(sub_title) < 3:
                                         continue
                                     
@@ -349,8 +704,8 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                                         id=f"{roadmap_id}_sub_{level_idx}_{branch_idx}_{sub_idx}",
                                         roadmap_id=roadmap_id,
                                         content=sub_title,
-                                        html_fragment=str(sub_branch),
-                                        embedding=[],
+                                        html_fragment=_node_html(sub_branch),
+                                        embedding=_EMPTY_EMBEDDING,
                                         chunk_index=chunk_index,
                                         metadata={
                                             "section": sub_title,
@@ -360,9 +715,9 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                                             "category": level_category,
                                             "type": "sub_branch",
                                             "keywords": extract_keywords(sub_title),
-                                            "tools": _extract_tools(sub_branch),
-                                            "resources": _extract_resources(sub_branch),
-                                            "learning_objectives": _extract_learning_objectives(sub_branch)
+                                            "tools": sub_tools,
+                                            "resources": sub_resources,
+                                            "learning_objectives": sub_objectives
                                         },
                                         collection_tags=[f"sub-branch-{sub_title}"],
                                         search_tags=[f"sub-branch-{sub_title}"]
@@ -370,95 +725,46 @@ def _parse_structured_content(roadmap_id: str, main_branches, soup) -> List[Road
                                     chunks.append(sub_chunk)
                                     chunk_index += 1
                                 except Exception as e:
-                                    st.warning(f"서브브랜치 파싱 오류: {str(e)}")
+                                    logger.warning("서브브랜치 파싱 오류: %s", e)
                                     continue
                                     
                         except Exception as e:
-                            st.warning(f"브랜치 파싱 오류: {str(e)}")
+                            logger.warning("브랜치 파싱 오류: %s", e)
                             continue
                             
             except Exception as e:
-                st.warning(f"레벨 파싱 오류: {str(e)}")
+                logger.warning("레벨 파싱 오류: %s", e)
                 continue
         
         # 최소한 하나의 청크라도 생성되도록 보장
         if not chunks:
             # 전체 HTML을 하나의 청크로 생성
-            fallback_chunk = RoadmapChunk(
-                id=f"{roadmap_id}_fallback_structured",
-                roadmap_id=roadmap_id,
-                content=main_title,
-                html_fragment=str(soup),
-                embedding=[],
-                chunk_index=0,
-                metadata={
-                    "section": main_title,
-                    "level": 1,
-                    "category": "unknown",
-                    "type": "fallback_structured",
-                    "keywords": extract_keywords(main_title),
-                    "tools": [],
-                    "resources": [],
-                    "learning_objectives": []
-                },
-                collection_tags=["unknown"],
-                search_tags=["unknown"]
-            )
-            chunks.append(fallback_chunk)
+            chunks.append(_make_fallback(roadmap_id, 'fallback_structured',
+                                         main_title, _node_html(root)))
             
     except Exception as e:
-        st.error(f"구조화된 파싱 중 오류: {str(e)}")
+        logger.error("구조화된 파싱 중 오류: %s", e)
         # 오류 발생 시 기본 청크 생성
-        fallback_chunk = RoadmapChunk(
-            id=f"{roadmap_id}_error_fallback",
-            roadmap_id=roadmap_id,
-            content="파싱 오류로 인한 기본 청크",
-            html_fragment="",
-            embedding=[],
-            chunk_index=0,
-            metadata={
-                "section": "오류",
-                "level": 1,
-                "category": "error",
-                "type": "error",
-                "keywords": [],
-                "tools": [],
-                "resources": [],
-                "learning_objectives": []
-            },
-            collection_tags=["error"],
-            search_tags=["error"]
-        )
-        chunks.append(fallback_chunk)
+        chunks.append(_make_fallback(roadmap_id, 'error_fallback', '오류', '',
+                                     category='error', chunk_type='error',
+                                     content='파싱 오류로 인한 기본 청크'))
     
     return chunks
 
-def _parse_basic_sections(roadmap_id: str, html_content: str) -> List[RoadmapChunk]:
+def _parse_basic_sections(roadmap_id: str, root) -> List[RoadmapChunk]:
     """기본 섹션별 분할"""
     chunks = []
     
     # 섹션별로 분할 (section, .step, .module, h2, h3 태그 기준)
-    section_patterns = [
-        r'<section[^>]*>(.*?)</section>',
-        r'<div[^>]*class="[^"]*step[^"]*"[^>]*>(.*?)</div>',
-        r'<div[^>]*class="[^"]*module[^"]*"[^>]*>(.*?)</div>',
-        r'<h2[^>]*>(.*?)</h2>',
-        r'<h3[^>]*>(.*?)</h3>',
-        r'<div[^>]*class="[^"]*"[^>]*>(.*?)</div>',  # 모든 div
-        r'<p[^>]*>(.*?)</p>'  # 모든 p 태그
-    ]
-    
-    all_sections = []
-    for pattern in section_patterns:
-        sections = re.findall(pattern, html_content, re.DOTALL | re.IGNORECASE)
-        all_sections.extend(sections)
-    
-    # 중복 제거 및 정리
+    # 이미 파싱된 트리를 한 번만 걸어 수집 — 문서 전체를 패턴 수만큼
+    # 재스캔하던 정규식 방식을 대체 (중첩 div 중복 카운트 문제도 해소)
     unique_sections = []
-    for section in all_sections:
-        cleaned = re.sub(r'<[^>]+>', '', section).strip()
-        if cleaned and len(cleaned) > 5:  # 최소 길이 조건 완화
-            unique_sections.append((section, cleaned))
+    seen = set()
+    for node in _node_css(root, 'section, div.step, div.module, h2, h3, div[class], p'):
+        cleaned = _node_text(node).strip()
+        if cleaned and len(cleaned) > 5 and cleaned not in seen:  # 최소 길이 조건 완화
+            seen.add(cleaned)
+            unique_sections.append((_node_html(node), cleaned))
     
     # 기본 청크 생성
     for i, (html_fragment, content) in enumerate(unique_sections):
@@ -469,23 +775,23 @@ def _parse_basic_sections(roadmap_id: str, html_content: str) -> List[RoadmapChu
 
 def _create_fallback_chunk(roadmap_id: str, html_content: str) -> List[RoadmapChunk]:
     """파싱 실패 시 기본 청크 생성"""
-    # HTML에서 텍스트만 추출
-    soup = BeautifulSoup(html_content, 'html.parser')
-    text_content = soup.get_text().strip()
+    # HTML에서 텍스트만 추출 — 전체 텍스트가 필요하므로 전체 파싱
+    root = _parse_document(html_content, full=True)
+    text_content = _node_text(root).strip()
     
     if not text_content:
         text_content = "파싱할 수 있는 내용이 없습니다."
     
     # 제목 추출 시도
-    title_elem = soup.find(['h1', 'title'])
-    title = title_elem.get_text().strip() if title_elem else "학습 로드맵"
+    title_elem = _node_first(root, 'h1, title')
+    title = _node_text(title_elem).strip() if title_elem is not None else "학습 로드맵"
     
     chunk = RoadmapChunk(
         id=f"{roadmap_id}_fallback",
         roadmap_id=roadmap_id,
         content=text_content[:500] + "..." if len(text_content) > 500 else text_content,
         html_fragment=html_content[:1000] + "..." if len(html_content) > 1000 else html_content,
-        embedding=[],
+        embedding=_EMPTY_EMBEDDING,
         chunk_index=0,
         metadata={
             "section": title,
@@ -507,7 +813,7 @@ def _create_fallback_chunk(roadmap_id: str, html_content: str) -> List[RoadmapCh
 def _create_basic_chunk(roadmap_id: str, index: int, html_fragment: str, content: str) -> RoadmapChunk:
     """기본 청크 생성"""
     # 섹션 제목 추출
-    title_match = re.search(r'<h[1-6][^>]*>(.*?)</h[1-6]>', html_fragment, re.IGNORECASE)
+    title_match = _HEADING_RE.search(html_fragment)
     section_title = title_match.group(1).strip() if title_match else f"섹션 {index+1}"
     
     # 키워드 추출
@@ -518,7 +824,7 @@ def _create_basic_chunk(roadmap_id: str, index: int, html_fragment: str, content
         roadmap_id=roadmap_id,
         content=content,
         html_fragment=html_fragment,
-        embedding=[],
+        embedding=_EMPTY_EMBEDDING,
         chunk_index=index,
         metadata={
             "section": section_title,
@@ -546,34 +852,29 @@ def _extract_category_from_classes(classes: List[str]) -> str:
 
 def _extract_tools(element) -> List[str]:
     """요소에서 도구 추출"""
-    tools = []
-    text = element.get_text().lower()
-    
-    # 도구 키워드 패턴
-    tool_patterns = [
-        r'\b(vscode|visual studio|sublime|atom|webstorm|intellij)\b',
-        r'\b(git|github|gitlab|bitbucket)\b',
-        r'\b(docker|kubernetes|jenkins|travis)\b',
-        r'\b(npm|yarn|webpack|vite|parcel)\b',
-        r'\b(react|vue|angular|svelte)\b',
-        r'\b(node\.js|express|django|flask|spring)\b'
-    ]
-    
-    for pattern in tool_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        tools.extend(matches)
-    
-    return list(set(tools))
+    return _extract_tools_from_text(_node_text(element))
+
+def _extract_all(element):
+    """도구/리소스/학습 목표를 서브트리 1회 순회로 모두 추출
+
+    요소 텍스트를 한 번만 얻어 세 추출기에 공유한다 — 노드마다
+    get_text()를 3번 반복하던 중복 트리 순회 제거.
+    반환: (tools, resources, objectives, text)
+    """
+    text = _node_text(element)
+    return (
+        _extract_tools_from_text(text),
+        _extract_resources(element),
+        _extract_learning_objectives_from_text(text),
+        text,
+    )
 
 def _extract_resources(element) -> List[Dict[str, str]]:
     """요소에서 리소스 추출"""
     resources = []
     
     # 링크 찾기
-    links = element.find_all('a', href=True)
-    for link in links:
-        url = link.get('href', '')
-        title = link.get_text().strip()
+    for url, title in _node_links(element):
         if url and title:
             resources.append({
                 'url': url,
@@ -586,33 +887,23 @@ def _extract_resources(element) -> List[Dict[str, str]]:
 def _extract_learning_objectives(element) -> List[str]:
     """요소에서 학습 목표 추출"""
     objectives = []
-    text = element.get_text()
-    
-    # 학습 목표 패턴
-    objective_patterns = [
-        r'학습\s*목표[:\s]*([^.]*)',
-        r'목표[:\s]*([^.]*)',
-        r'이해\s*할\s*수\s*있[어야]*\s*한다?[:\s]*([^.]*)',
-        r'할\s*수\s*있[어야]*\s*한다?[:\s]*([^.]*)'
-    ]
+    text = _node_text(element)
     
-    for pattern in objective_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        objectives.extend(matches)
+    for pattern in _OBJECTIVE_PATTERNS:
+        objectives.extend(pattern.findall(text))
     
     return objectives
 
 def _extract_tools_from_text(text: str) -> List[str]:
     """텍스트에서 도구 추출"""
-    return _extract_tools_from_text_helper(text)
+    return list(_scan_literals(text)['tool'])
 
 def _extract_resources_from_text(text: str) -> List[Dict[str, str]]:
     """텍스트에서 리소스 추출"""
     resources = []
     
     # URL 패턴 찾기
-    url_pattern = r'https?://[^\s<>"]+'
-    urls = re.findall(url_pattern, text)
+    urls = _URL_RE.findall(text)
     
     for url in urls:
         resources.append({
@@ -625,61 +916,94 @@ def _extract_resources_from_text(text: str) -> List[Dict[str, str]]:
 
 def _extract_learning_objectives_from_text(text: str) -> List[str]:
     """텍스트에서 학습 목표 추출"""
-    return _extract_learning_objectives_from_text_helper(text)
-
-def _extract_tools_from_text_helper(text: str) -> List[str]:
-    """텍스트에서 도구 추출 헬퍼 함수"""
-    tools = []
-    text_lower = text.lower()
-    
-    tool_patterns = [
-        r'\b(vscode|visual studio|sublime|atom|webstorm|intellij)\b',
-        r'\b(git|github|gitlab|bitbucket)\b',
-        r'\b(docker|kubernetes|jenkins|travis)\b',
-        r'\b(npm|yarn|webpack|vite|parcel)\b',
-        r'\b(react|vue|angular|svelte)\b',
-        r'\b(node\.js|express|django|flask|spring)\b'
-    ]
-    
-    for pattern in tool_patterns:
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
-        tools.extend(matches)
-    
-    return list(set(tools))
-
-def _extract_learning_objectives_from_text_helper(text: str) -> List[str]:
-    """텍스트에서 학습 목표 추출 헬퍼 함수"""
     objectives = []
     
-    objective_patterns = [
-        r'학습\s*목표[:\s]*([^.]*)',
-        r'목표[:\s]*([^.]*)',
-        r'이해\s*할\s*수\s*있[어야]*\s*한다?[:\s]*([^.]*)',
-        r'할\s*수\s*있[어야]*\s*한다?[:\s]*([^.]*)'
-    ]
-    
-    for pattern in objective_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        objectives.extend(matches)
+    for pattern in _OBJECTIVE_PATTERNS:
+        objectives.extend(pattern.findall(text))
     
     return objectives
 
+# 리소스 타입 판별용 확장자 튜플/도메인 패턴 (str.endswith는 C 단일 패스)
+_DOC_EXT = ('.pdf', '.doc', '.docx')
+_VIDEO_EXT = ('.mp4', '.avi', '.mov')
+_IMG_EXT = ('.jpg', '.png', '.gif')
+_VIDEO_HOSTS_RE = re.compile(r'youtube\.com|vimeo\.com')
+_TUTORIAL_HOSTS_RE = re.compile(r'stackoverflow\.com|docs\.|tutorial')
+
 def _determine_resource_type(url: str) -> str:
     """URL에서 리소스 타입 결정"""
     url_lower = url.lower()
-    if any(ext in url_lower for ext in ['.pdf', '.doc', '.docx']):
+    if url_lower.endswith(_DOC_EXT):
         return 'document'
-    elif any(ext in url_lower for ext in ['.mp4', '.avi', '.mov', 'youtube.com', 'vimeo.com']):
+    elif url_lower.endswith(_VIDEO_EXT) or _VIDEO_HOSTS_RE.search(url_lower):
         return 'video'
-    elif any(ext in url_lower for ext in ['.jpg', '.png', '.gif']):
+    elif url_lower.endswith(_IMG_EXT):
         return 'image'
     elif 'github.com' in url_lower:
         return 'code'
-    elif any(domain in url_lower for domain in ['stackoverflow.com', 'docs.', 'tutorial']):
+    elif _TUTORIAL_HOSTS_RE.search(url_lower):
         return 'tutorial'
     else:
         return 'link'
 
+# 내용 기반 태그 패턴 — 호출마다 dict 리터럴을 다시 만들지 않도록 모듈
+# 상수로 올리고, 오토마톤 1회 패스로 태그×패턴 반복 스캔을 대체한다
+_TECH_TAG_PATTERNS = {
+    "frontend": ["react", "vue", "angular", "html", "css", "javascript", "typescript"],
+    "backend": ["nodejs", "python", "java", "php", "ruby", "go"],
+    "database": ["sql", "mongodb", "postgresql", "mysql", "redis"],
+    "devops": ["docker", "kubernetes", "jenkins", "git", "aws", "azure"],
+    "mobile": ["react-native", "flutter", "ios", "android", "swift", "kotlin"],
+    "ai": ["machine-learning", "deep-learning", "tensorflow", "pytorch", "scikit-learn"],
+    "security": ["authentication", "authorization", "encryption", "ssl", "oauth"],
+    "testing": ["unit-test", "integration-test", "e2e-test", "jest", "cypress"]
+}
+_DOMAIN_TAG_PATTERNS = {
+    "web-development": ["web", "website", "frontend", "backend"],
+    "mobile-development": ["mobile", "app", "ios", "android"],
+    "data-science": ["data", "analysis", "statistics", "machine-learning"],
+    "game-development": ["game", "unity", "unreal", "gaming"],
+    "cybersecurity": ["security", "hacking", "penetration", "vulnerability"]
+}
+
+if ahocorasick is not None:
+    _TAG_PATTERN_AUTOMATON = ahocorasick.Automaton()
+    _pattern_tags: Dict[str, set] = {}
+    for _tag, _patterns in _TECH_TAG_PATTERNS.items():
+        for _p in _patterns:
+            _pattern_tags.setdefault(_p, set()).add(('search', _tag))
+    for _tag, _patterns in _DOMAIN_TAG_PATTERNS.items():
+        for _p in _patterns:
+            _pattern_tags.setdefault(_p, set()).add(('collection', _tag))
+    for _p, _tags in _pattern_tags.items():
+        _TAG_PATTERN_AUTOMATON.add_word(_p, tuple(_tags))
+    _TAG_PATTERN_AUTOMATON.make_automaton()
+    del _pattern_tags
+else:
+    _TAG_PATTERN_AUTOMATON = None
+
+@functools.lru_cache(maxsize=1024)
+def _content_tag_scan(content_lower: str) -> tuple:
+    """내용 기반 (검색 태그, 수집 태그) frozenset 쌍을 추출
+
+    오토마톤이 있으면 O(텍스트 + 매치 수) 1회 패스, 없으면 기존처럼
+    태그별 any() 스캔으로 폴백. 원본과 동일하게 단어 경계 없는 부분
+    일치 의미를 유지하며, 같은 내용의 재호출은 lru_cache가 흡수한다.
+    """
+    search, collection = set(), set()
+    if _TAG_PATTERN_AUTOMATON is not None:
+        for _end, tags in _TAG_PATTERN_AUTOMATON.iter(content_lower):
+            for kind, tag in tags:
+                (search if kind == 'search' else collection).add(tag)
+    else:
+        for tag, patterns in _TECH_TAG_PATTERNS.items():
+            if any(p in content_lower for p in patterns):
+                search.add(tag)
+        for domain, patterns in _DOMAIN_TAG_PATTERNS.items():
+            if any(p in content_lower for p in patterns):
+                collection.add(domain)
+    return frozenset(search), frozenset(collection)
+
 def suggest_tags_for_chunk(chunk_content: str, chunk_metadata: Dict[str, Any]) -> Dict[str, List[str]]:
     """청크 내용과 메타데이터를 기반으로 수집 태그와 검색 태그 제안"""
     collection_tags = []
@@ -715,38 +1039,11 @@ def suggest_tags_for_chunk(chunk_content: str, chunk_metadata: Dict[str, Any]) -
     if level:
         collection_tags.append(f"hierarchy-level-{level}")
     
-    # 내용 기반 검색 태그 추출
-    content_lower = chunk_content.lower()
-    
-    # 기술 스택 검색 태그
-    tech_patterns = {
-        "frontend": ["react", "vue", "angular", "html", "css", "javascript", "typescript"],
-        "backend": ["nodejs", "python", "java", "php", "ruby", "go"],
-        "database": ["sql", "mongodb", "postgresql", "mysql", "redis"],
-        "devops": ["docker", "kubernetes", "jenkins", "git", "aws", "azure"],
-        "mobile": ["react-native", "flutter", "ios", "android", "swift", "kotlin"],
-        "ai": ["machine-learning", "deep-learning", "tensorflow", "pytorch", "scikit-learn"],
-        "security": ["authentication", "authorization", "encryption", "ssl", "oauth"],
-        "testing": ["unit-test", "integration-test", "e2e-test", "jest", "cypress"]
-    }
-    
-    for tag, patterns in tech_patterns.items():
-        if any(pattern in content_lower for pattern in patterns):
-            search_tags.append(tag)
-    
-    # 도메인별 수집 태그
-    domain_patterns = {
-        "web-development": ["web", "website", "frontend", "backend"],
-        "mobile-development": ["mobile", "app", "ios", "android"],
-        "data-science": ["data", "analysis", "statistics", "machine-learning"],
-        "game-development": ["game", "unity", "unreal", "gaming"],
-        "cybersecurity": ["security", "hacking", "penetration", "vulnerability"]
-    }
-    
-    for domain, patterns in domain_patterns.items():
-        if any(pattern in content_lower for pattern in patterns):
-            collection_tags.append(domain)
-    
+    # 내용 기반 태그 추출 (오토마톤 1회 패스 + 내용별 메모이즈)
+    content_search, content_collection = _content_tag_scan(chunk_content.lower())
+    search_tags.extend(content_search)
+    collection_tags.extend(content_collection)
+
     return {
         "collection_tags": list(set(collection_tags)),
         "search_tags": list(set(search_tags))
@@ -772,7 +1069,7 @@ def apply_tags_to_chunk(chunk: RoadmapChunk, custom_collection_tags: List[str] =
         existing_keywords = updated_metadata.get("keywords", [])
         updated_metadata["keywords"] = list(set(existing_keywords + custom_search_tags))
     
-    # 새로운 청크 객체 생성
+    # 새로운 청크 객체 생성 (태그는 intern으로 싱글턴화)
     return RoadmapChunk(
         id=chunk.id,
         roadmap_id=chunk.roadmap_id,
@@ -781,166 +1078,289 @@ def apply_tags_to_chunk(chunk: RoadmapChunk, custom_collection_tags: List[str] =
         embedding=chunk.embedding,
         chunk_index=chunk.chunk_index,
         metadata=updated_metadata,
-        collection_tags=updated_collection_tags,
-        search_tags=updated_search_tags
+        collection_tags=[sys.intern(t) for t in updated_collection_tags],
+        search_tags=[sys.intern(t) for t in updated_search_tags]
     )
 
+def _merge_tags_inplace(chunks: List[RoadmapChunk],
+                        custom_collection_tags: List[str] = None,
+                        custom_search_tags: List[str] = None) -> None:
+    """모든 청크에 태그를 제자리에서 병합 — 일괄 적용 전용.
+
+    apply_tags_to_chunk는 청크마다 새 객체를 만들지만, 일괄 적용은 어차피
+    전체를 교체하므로 set 합집합으로 필드만 갱신한다 (N개 객체 할당 제거).
+    태그에서 파생된 캐시 필드는 직접 무효화한다."""
+    coll_set = set(custom_collection_tags or ())
+    srch_set = set(custom_search_tags or ())
+    if not coll_set and not srch_set:
+        return
+
+    for chunk in chunks:
+        if coll_set:
+            chunk.collection_tags = [sys.intern(t) for t in set(chunk.collection_tags) | coll_set]
+        if srch_set:
+            chunk.search_tags = [sys.intern(t) for t in set(chunk.search_tags) | srch_set]
+            # 기존 키워드도 유지하며 병합 (apply_tags_to_chunk와 동일 규칙)
+            chunk.metadata["keywords"] = list(set(chunk.metadata.get("keywords", [])) | srch_set)
+        chunk.tags_exact = None
+        chunk.tags_lower = None
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_tag_index(tags_key: tuple, tag_type: str) -> Dict[str, frozenset]:
+    """소문자 태그 → 청크 인덱스 집합 역색인
+
+    tags_key는 (chunk.id, 태그 튜플)의 튜플 — 태그가 바뀌면 키도 바뀌어
+    캐시가 자연히 무효화된다. 질의는 태그당 O(1) 조회 + set 합집합으로 끝난다.
+    """
+    index: Dict[str, set] = {}
+    for i, (_chunk_id, tags) in enumerate(tags_key):
+        for tag in tags:
+            index.setdefault(tag.lower(), set()).add(i)
+    return {tag: frozenset(indices) for tag, indices in index.items()}
+
 def search_chunks_by_tags(chunks: List[RoadmapChunk], search_tags: List[str], tag_type: str = "search") -> List[RoadmapChunk]:
     """태그 기반으로 청크 검색 (수집 태그 또는 검색 태그 선택 가능)"""
     if not search_tags:
         return chunks
     
-    matched_chunks = []
-    for chunk in chunks:
-        if tag_type == "collection":
-            chunk_tags = chunk.collection_tags
-        else:  # search
-            chunk_tags = chunk.search_tags
-        
-        # 하나라도 매칭되면 포함
-        if any(tag.lower() in [ct.lower() for ct in chunk_tags] for tag in search_tags):
-            matched_chunks.append(chunk)
+    # 역색인 조회 — 전체 청크 선형 스캔 대신 매칭 태그의 인덱스만 합친다
+    if tag_type == "collection":
+        tags_key = tuple((chunk.id, tuple(chunk.collection_tags)) for chunk in chunks)
+    else:  # search
+        tags_key = tuple((chunk.id, tuple(chunk.search_tags)) for chunk in chunks)
+    index = _build_tag_index(tags_key, tag_type)
     
-    return matched_chunks
+    matched: set = set()
+    for tag in search_tags:
+        matched |= index.get(tag.lower(), frozenset())
+    
+    # 원래 청크 순서 유지
+    return [chunks[i] for i in sorted(matched)]
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def get_tag_statistics(chunks: List[RoadmapChunk]) -> Dict[str, Dict[str, int]]:
-    """청크들의 수집 태그와 검색 태그 통계 계산"""
-    collection_tag_counts = {}
-    search_tag_counts = {}
-    
+    """청크들의 수집 태그와 검색 태그 통계 계산
+
+    청크 목록이 그대로면 위젯 클릭마다 재집계하지 않는다 — 태그 편집으로
+    목록이 바뀌면 캐시 키도 바뀌어 자연히 무효화된다 (chunks_to_df와 동일)."""
+    # Counter.update는 C 레벨에서 집계 — 태그당 dict.get/set 왕복 제거
+    collection_tag_counts = Counter()
+    search_tag_counts = Counter()
+
     for chunk in chunks:
-        # 수집 태그 통계
-        for tag in chunk.collection_tags:
-            tag_lower = tag.lower()
-            collection_tag_counts[tag_lower] = collection_tag_counts.get(tag_lower, 0) + 1
-        
-        # 검색 태그 통계
-        for tag in chunk.search_tags:
-            tag_lower = tag.lower()
-            search_tag_counts[tag_lower] = search_tag_counts.get(tag_lower, 0) + 1
-    
+        collection_tag_counts.update(tag.lower() for tag in chunk.collection_tags)
+        search_tag_counts.update(tag.lower() for tag in chunk.search_tags)
+
     return {
-        "collection_tags": collection_tag_counts,
-        "search_tags": search_tag_counts
+        "collection_tags": dict(collection_tag_counts),
+        "search_tags": dict(search_tag_counts)
     }
 
-def calculate_similarity(query: str, chunk_content: str) -> float:
-    """간단한 유사도 계산 (실제로는 벡터 임베딩 사용)"""
-    query_words = set(query.lower().split())
-    content_words = set(chunk_content.lower().split())
-    
-    if not query_words or not content_words:
-        return 0.0
-    
-    intersection = query_words.intersection(content_words)
-    union = query_words.union(content_words)
-    
-    return len(intersection) / len(union) if union else 0.0
+@st.cache_data(show_spinner=False, max_entries=32)
+def _parse_stats(chunks: List[RoadmapChunk]) -> Dict[str, Dict[str, int]]:
+    """타입/카테고리 분포 집계 — 같은 청크 목록에 대해 1회만 계산"""
+    return {
+        "types": dict(Counter(c.metadata.get("type", "unknown") for c in chunks)),
+        "categories": dict(Counter(c.metadata.get("category", "unknown") for c in chunks)),
+    }
 
-def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDocument], threshold: float = 0.1) -> str:
-    """검색어 기반으로 관련 청크를 찾아 인터랙티브 마인드맵 HTML을 재생성합니다."""
-    relevant_chunks = []
-    
-    # 파일명으로 검색하는 경우 특별 처리
-    is_filename_search = query.startswith("filename:") or query.startswith("source:")
-    
-    # 모든 문서의 청크에서 검색
-    for doc_id, document in roadmap_documents.items():
-        for chunk in document.chunks:
-            similarity = 0.0
-            
-            if is_filename_search:
-                # 파일명 검색인 경우 태그 기반으로 검색
-                if query in chunk.collection_tags or query in chunk.search_tags:
-                    similarity = 1.0  # 완전 일치
-                elif query.lower() in [tag.lower() for tag in chunk.collection_tags + chunk.search_tags]:
-                    similarity = 0.8  # 대소문자 무시 일치
-            else:
-                # 일반 텍스트 검색
-                similarity = calculate_similarity(query, chunk.content)
-            
-            if similarity >= threshold:
-                relevant_chunks.append({
-                    "chunk": chunk,
-                    "similarity": similarity,
-                    "document_title": document.title
-                })
-    
-    # 유사도 순으로 정렬
-    relevant_chunks.sort(key=lambda x: x["similarity"], reverse=True)
-    top_chunks = relevant_chunks[:20]  # 상위 20개로 증가
-    
-    if not top_chunks:
-        return "<h1>검색 결과가 없습니다</h1>"
-    
-    # 중복 제거 및 그룹화
-    unique_chunks = {}
-    for item in top_chunks:
-        chunk = item["chunk"]
-        # 청크 ID를 기준으로 중복 제거
-        if chunk.id not in unique_chunks:
-            unique_chunks[chunk.id] = item
-        else:
-            # 더 높은 유사도를 가진 것을 유지
-            if item["similarity"] > unique_chunks[chunk.id]["similarity"]:
-                unique_chunks[chunk.id] = item
-    
-    # 중복 제거된 청크들을 다시 정렬
-    unique_chunks_list = list(unique_chunks.values())
-    unique_chunks_list.sort(key=lambda x: x["similarity"], reverse=True)
-    
-    # 카테고리별로 그룹화
-    categories = {
-        "beginner": [],
-        "intermediate": [],
-        "advanced": [],
-        "community": []
+@st.cache_data(show_spinner=False, max_entries=32)
+def _doc_summary_stats(chunks: List[RoadmapChunk]) -> Dict[str, Any]:
+    """도구/리소스 타입/학습 목표 요약 통계
+
+    청크별 dict-증가 루프 네 개 대신 평탄화 후 value_counts 한 번 —
+    집계와 내림차순 정렬이 모두 C 레벨에서 끝난다."""
+    tools = pd.Series(
+        [t for c in chunks for t in c.metadata.get("tools", [])], dtype="object")
+    resource_types = pd.Series(
+        [r.get("type", "unknown")
+         for c in chunks for r in c.metadata.get("resources", [])],
+        dtype="object")
+    objectives = [o for c in chunks for o in c.metadata.get("learning_objectives", [])]
+    return {
+        "tool_counts": tools.value_counts(),
+        "resource_type_counts": resource_types.value_counts(),
+        "objectives": objectives,
     }
-    
-    for item in unique_chunks_list:
-        chunk = item["chunk"]
-        category = chunk.metadata.get("category", "community").lower()
-        if category in categories:
-            categories[category].append(item)
-        else:
-            categories["community"].append(item)
-    
-    # HTML 템플릿 (인터랙티브 마인드맵)
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="ko">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{query} - 검색 결과 기반 학습 로드맵</title>
-        <style>
-            body {{
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def chunks_to_df(chunks: List[RoadmapChunk]) -> pd.DataFrame:
+    """청크 목록을 표시용 DataFrame으로 1회 변환 (리런 간 캐시)
+
+    N개의 위젯 할당 대신 st.dataframe 한 번으로 렌더링할 수 있도록
+    컬럼형 데이터로 경계에서 변환한다."""
+    records = []
+    for chunk in chunks:
+        meta = chunk.metadata
+        records.append({
+            "ID": chunk.id,
+            "섹션": meta.get("section", "N/A"),
+            "타입": meta.get("type", "N/A"),
+            "레벨": meta.get("level", "N/A"),
+            "카테고리": meta.get("category", "N/A"),
+            "키워드": ", ".join(meta.get("keywords", [])[:3]),
+            "도구": ", ".join(meta.get("tools", [])[:2]),
+            "수집 태그": ", ".join(chunk.collection_tags[:3]),
+            "검색 태그": ", ".join(chunk.search_tags[:3]),
+            "내용 길이": len(chunk.content),
+            "내용 미리보기": _chunk_preview100(chunk)
+        })
+    return pd.DataFrame.from_records(records)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _chunk_details_df(chunks: List[RoadmapChunk]) -> pd.DataFrame:
+    """청크 상세 정보 표 (chunks_to_df와 같은 요령으로 리런 간 캐시)
+
+    미리보기 표와 거의 같은 추출 루프가 페이지마다 반복되던 것을
+    한 곳으로 모으고, 같은 청크 목록이면 재구성하지 않는다."""
+    records = []
+    for i, chunk in enumerate(chunks):
+        meta = chunk.metadata
+        records.append({
+            "순서": i + 1,
+            "ID": chunk.id,
+            "섹션": meta.get("section", "N/A"),
+            "타입": meta.get("type", "N/A"),
+            "레벨": meta.get("level", "N/A"),
+            "카테고리": meta.get("category", "N/A"),
+            "키워드 수": len(meta.get("keywords", [])),
+            "도구 수": len(meta.get("tools", [])),
+            "리소스 수": len(meta.get("resources", [])),
+            "학습목표 수": len(meta.get("learning_objectives", [])),
+            "수집 태그": ", ".join(chunk.collection_tags[:3]),
+            "검색 태그": ", ".join(chunk.search_tags[:3]),
+            "내용 길이": len(chunk.content),
+            "HTML 길이": len(chunk.html_fragment)
+        })
+    return pd.DataFrame.from_records(records)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _roadmaps_summary_df(rows: tuple) -> pd.DataFrame:
+    """로드맵 목록 요약 표 — 목록이 그대로면 리런마다 재생성하지 않는다.
+
+    rows는 (주제, 난이도, 중점분야, 생성시간) 튜플의 튜플이라 해시 가능하고,
+    로드맵이 추가되면 키가 바뀌어 캐시가 자연히 무효화된다."""
+    return pd.DataFrame.from_records(
+        rows, columns=["주제", "난이도", "중점분야", "생성시간"])
+
+def _token_set(text: str) -> frozenset:
+    """텍스트를 소문자 토큰 frozenset으로 변환합니다."""
+    return frozenset(text.lower().split())
+
+def _chunk_tokens(chunk: RoadmapChunk) -> frozenset:
+    """청크 content의 토큰 집합을 반환합니다 (최초 1회만 계산 후 캐시)."""
+    tokens = chunk.content_tokens
+    if tokens is None:
+        tokens = _token_set(chunk.content)
+        chunk.content_tokens = tokens
+    return tokens
+
+def _chunk_tag_sets(chunk: RoadmapChunk) -> tuple:
+    """청크의 (원본 케이스, 소문자) 태그 frozenset 쌍을 반환합니다.
+
+    최초 1회만 계산해 청크에 캐시한다. apply_tags_to_chunk는 새 청크를
+    만들므로 태그가 바뀌면 캐시도 자연히 초기화된다.
+    """
+    exact = chunk.tags_exact
+    if exact is None:
+        exact = frozenset(chunk.collection_tags) | frozenset(chunk.search_tags)
+        chunk.tags_exact = exact
+        chunk.tags_lower = frozenset(t.lower() for t in exact)
+    return exact, chunk.tags_lower
+
+def _chunk_category(chunk: RoadmapChunk) -> str:
+    """청크의 소문자 카테고리를 반환합니다 (최초 1회만 계산 후 캐시)."""
+    category = chunk.category_lower
+    if category is None:
+        category = (chunk.metadata.get("category") or "community").lower()
+        chunk.category_lower = category
+    return category
+
+def _chunk_preview100(chunk: RoadmapChunk) -> str:
+    """청크 내용의 100자 미리보기를 반환합니다 (최초 1회만 계산 후 캐시)."""
+    preview = chunk.content_preview_100
+    if preview is None:
+        content = chunk.content
+        preview = content[:100] + "..." if len(content) > 100 else content
+        chunk.content_preview_100 = preview
+    return preview
+
+def calculate_similarity(query_tokens: frozenset, chunk_tokens: frozenset) -> float:
+    """간단한 유사도 계산 (실제로는 벡터 임베딩 사용)
+
+    미리 토큰화된 집합끼리의 Jaccard 유사도. union 집합을 새로 만들지 않고
+    |A∪B| = |A| + |B| - |A∩B| 로 크기만 계산한다. 교집합도 임시 집합 없이
+    작은 쪽을 순회하며 세고, 겹치는 토큰이 없으면 바로 0을 반환한다
+    (대부분의 후보가 임계값 미만이므로 이 경로가 지배적).
+    """
+    if not query_tokens or not chunk_tokens:
+        return 0.0
+
+    small, large = ((query_tokens, chunk_tokens)
+                    if len(query_tokens) <= len(chunk_tokens)
+                    else (chunk_tokens, query_tokens))
+    inter = sum(1 for token in small if token in large)
+    if inter == 0:
+        return 0.0
+    return inter / (len(query_tokens) + len(chunk_tokens) - inter)
+
+# html.escape는 호출마다 파이썬 레벨 .replace를 5번 수행한다. 필요한 치환이
+# 전부 1문자라서 미리 만든 테이블로 C 레벨 translate 1회에 끝낼 수 있다.
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;',
+})
+
+def _esc(s: str) -> str:
+    """html.escape와 동일한 결과를 내는 단일 패스 HTML 이스케이프."""
+    return s.translate(_HTML_ESCAPE_TABLE)
+
+# 결과 항목 루프에서 반복 조립되는 단문 조각 — 루프 안에서 같은 리터럴
+# 스캐폴딩을 매번 f-string으로 재구성하지 않도록 모듈 상수 템플릿으로 분리
+_DETAIL_TMPL = '<div class="detail-node">{s}</div>'
+_TOOLS_TMPL = '<div class="detail-node">🔧 도구: {s}</div>'
+_OBJECTIVE_TMPL = '<div class="detail-node">🎯 {s}</div>'
+_SIMILARITY_TMPL = '<div class="similarity-score">유사도: {s:.2f}</div>'
+_RESOURCE_LINK_TMPL = ('<div class="resource-node">🔗 <a href="{url}" target="_blank" '
+                       'rel="noopener noreferrer">{title}</a></div>')
+_RESOURCE_TEXT_TMPL = '<div class="resource-node">📚 {s}</div>'
+
+# startswith는 튜플을 받으면 C 레벨에서 한 번에 검사한다
+_VALID_SCHEMES = ("http://", "https://")
+
+# community 외에 전용 브랜치를 갖는 카테고리
+_BRANCH_CATEGORIES = frozenset({"beginner", "intermediate", "advanced"})
+
+# 마인드맵 HTML의 정적 <style>/<script> 블록 — 동적 값이 전혀 없으므로
+# 호출마다 수 KB짜리 f-string을 재파싱하지 않도록 모듈 상수로 호이스팅.
+# 검색 결과용/로드맵용 마인드맵이 같은 블록을 공유한다.
+_MINDMAP_STYLE = """<style>
+            body {
                 margin: 0;
                 padding: 20px;
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 min-height: 100vh;
                 overflow-x: auto;
-            }}
+            }
 
-            .mindmap-container {{
+            .mindmap-container {
                 background: rgba(255, 255, 255, 0.95);
                 border-radius: 15px;
                 padding: 30px;
                 box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
                 min-width: 1200px;
-            }}
+            }
 
-            .mindmap-title {{
+            .mindmap-title {
                 text-align: center;
                 font-size: 2.5em;
                 font-weight: bold;
                 color: #2c3e50;
                 margin-bottom: 30px;
                 text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
-            }}
+            }
 
-            .search-info {{
+            .search-info {
                 text-align: center;
                 font-size: 1.2em;
                 color: #34495e;
@@ -948,16 +1368,16 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 background: rgba(52, 152, 219, 0.1);
                 padding: 15px;
                 border-radius: 10px;
-            }}
+            }
 
-            .mindmap {{
+            .mindmap {
                 display: flex;
                 flex-direction: column;
                 align-items: center;
                 gap: 30px;
-            }}
+            }
 
-            .root-node {{
+            .root-node {
                 background: linear-gradient(135deg, #FF6B6B, #FF8E53);
                 color: white;
                 padding: 20px 40px;
@@ -967,28 +1387,28 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 box-shadow: 0 10px 25px rgba(255, 107, 107, 0.3);
                 cursor: pointer;
                 transition: all 0.3s ease;
-            }}
+            }
 
-            .root-node:hover {{
+            .root-node:hover {
                 transform: translateY(-5px);
                 box-shadow: 0 15px 35px rgba(255, 107, 107, 0.4);
-            }}
+            }
 
-            .main-branches {{
+            .main-branches {
                 display: flex;
                 justify-content: space-around;
                 width: 100%;
                 gap: 30px;
                 flex-wrap: wrap;
-            }}
+            }
 
-            .branch {{
+            .branch {
                 flex: 1;
                 min-width: 350px;
                 max-width: 400px;
-            }}
+            }
 
-            .level-node {{
+            .level-node {
                 padding: 15px 25px;
                 border-radius: 20px;
                 font-weight: bold;
@@ -997,56 +1417,57 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 margin-bottom: 15px;
                 text-align: center;
                 box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            }}
+            }
 
-            .beginner {{
+            .beginner {
                 background: linear-gradient(135deg, #4ECDC4, #44A08D);
                 color: white;
-            }}
+            }
 
-            .intermediate {{
+            .intermediate {
                 background: linear-gradient(135deg, #FDBB2D, #22C1C3);
                 color: white;
-            }}
+            }
 
-            .advanced {{
+            .advanced {
                 background: linear-gradient(135deg, #FA8072, #FF6347);
                 color: white;
-            }}
+            }
 
-            .community {{
+            .community {
                 background: linear-gradient(135deg, #667eea, #764ba2);
                 color: white;
-            }}
+            }
 
-            .level-node:hover {{
+            .level-node:hover {
                 transform: translateY(-3px);
                 box-shadow: 0 8px 25px rgba(0, 0, 0, 0.2);
-            }}
+            }
 
-            .sub-branches {{
+            .sub-branches {
                 margin-left: 20px;
                 margin-top: 15px;
                 display: none;
-            }}
+            }
 
-            .sub-branches.expanded {{
+            /* 상태는 헤더의 .expanded 하나 — 하위 목록은 인접 형제 선택자로 유도 */
+            .expanded + .sub-branches {
                 display: block;
                 animation: slideDown 0.3s ease-out;
-            }}
+            }
 
-            @keyframes slideDown {{
-                from {{
+            @keyframes slideDown {
+                from {
                     opacity: 0;
                     max-height: 0;
-                }}
-                to {{
+                }
+                to {
                     opacity: 1;
                     max-height: 1000px;
-                }}
-            }}
+                }
+            }
 
-            .sub-node {{
+            .sub-node {
                 background: rgba(255, 255, 255, 0.9);
                 border-left: 4px solid #3498db;
                 padding: 12px 20px;
@@ -1056,14 +1477,14 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);
                 cursor: pointer;
                 transition: all 0.2s ease;
-            }}
+            }
 
-            .sub-node:hover {{
+            .sub-node:hover {
                 background: rgba(52, 152, 219, 0.1);
                 transform: translateX(5px);
-            }}
+            }
 
-            .detail-node {{
+            .detail-node {
                 background: rgba(255, 255, 255, 0.7);
                 border-left: 3px solid #95a5a6;
                 padding: 8px 15px;
@@ -1071,9 +1492,9 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 border-radius: 5px;
                 font-size: 0.85em;
                 color: #2c3e50;
-            }}
+            }
 
-            .resource-node {{
+            .resource-node {
                 background: rgba(46, 204, 113, 0.1);
                 border-left: 3px solid #2ecc71;
                 padding: 8px 15px;
@@ -1081,9 +1502,9 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 border-radius: 5px;
                 font-size: 0.85em;
                 color: #27ae60;
-            }}
+            }
 
-            .similarity-score {{
+            .similarity-score {
                 background: rgba(231, 76, 60, 0.1);
                 border-left: 3px solid #e74c3c;
                 padding: 8px 15px;
@@ -1092,9 +1513,9 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 font-size: 0.85em;
                 color: #c0392b;
                 font-weight: bold;
-            }}
+            }
 
-            .resource-node a {{
+            .resource-node a {
                 color: #2980b9;
                 text-decoration: underline;
                 font-weight: 500;
@@ -1102,31 +1523,48 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 padding: 2px 4px;
                 border-radius: 3px;
                 background: rgba(41, 128, 185, 0.1);
-            }}
+            }
 
-            .resource-node a:hover {{
+            .resource-node a:hover {
                 color: #ffffff;
                 background: #3498db;
                 text-decoration: none;
                 transform: translateX(3px);
                 box-shadow: 0 2px 8px rgba(52, 152, 219, 0.3);
-            }}
+            }
 
-            .expand-icon {{
+            .expand-icon {
                 float: right;
                 transition: transform 0.3s ease;
-            }}
+            }
 
-            .expand-icon.rotated {{
+            /* 회전/글리프도 헤더의 .expanded에서 유도 — 아이콘에 별도 클래스 없음 */
+            .expanded > .expand-icon,
+            .main-branches.all-expanded .expand-icon {
                 transform: rotate(90deg);
-            }}
+            }
 
-            .controls {{
+            /* 아이콘 글리프는 ::before가 전담 — JS가 innerHTML을 쓸 일이 없다 */
+            .expand-icon::before {
+                content: '▶';
+            }
+
+            .expanded > .expand-icon::before,
+            .main-branches.all-expanded .expand-icon::before {
+                content: '▼';
+            }
+
+            /* 전체 펼침은 컨테이너 클래스 하나로 — 가지마다 DOM을 쓰지 않는다 */
+            .main-branches.all-expanded .sub-branches {
+                display: block;
+            }
+
+            .controls {
                 text-align: center;
                 margin-bottom: 20px;
-            }}
+            }
 
-            .btn {{
+            .btn {
                 background: linear-gradient(135deg, #667eea, #764ba2);
                 color: white;
                 border: none;
@@ -1136,180 +1574,88 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 margin: 0 10px;
                 font-size: 0.9em;
                 transition: all 0.3s ease;
-            }}
+            }
 
-            .btn:hover {{
+            .btn:hover {
                 transform: translateY(-2px);
                 box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="mindmap-container">
-            <h1 class="mindmap-title">{query} 학습 로드맵</h1>
-            
-            <div class="search-info">
-                🔍 검색어: <strong>{query}</strong> | 📊 검색 결과: <strong>{len(unique_chunks_list)}개</strong> | 
-                📚 소스 문서: <strong>{len(set(item['chunk'].roadmap_id for item in unique_chunks_list))}개</strong>
-            </div>
-
-            <div class="controls">
-                <button class="btn" onclick="expandAll()">전체 펼치기</button>
-                <button class="btn" onclick="collapseAll()">전체 접기</button>
-            </div>
-
-            <div class="mindmap">
-                <div class="root-node" onclick="toggleAllBranches()">
-                    {query} 학습 로드맵
-                </div>
-
-                <div class="main-branches" id="mainBranches" style="display: none;">
-    """
-    
-    # 카테고리별로 브랜치 생성
-    category_names = {
-        "beginner": "초급 (Beginner)",
-        "intermediate": "중급 (Intermediate)", 
-        "advanced": "고급 (Advanced)",
-        "community": "커뮤니티 (Community)"
-    }
-    
-    for category, items in categories.items():
-        if items:  # 해당 카테고리에 항목이 있는 경우만
-            html_content += f"""
-                    <div class="branch">
-                        <div class="level-node {category}" onclick="toggleBranch('{category}')">
-                            {category_names[category]} <span class="expand-icon">▶</span>
-                        </div>
-                        <div class="sub-branches" id="{category}">
-                            <div class="sub-node" onclick="toggleSubBranch('{category}-details')">
-                                검색 결과 <span class="expand-icon">▶</span>
-                            </div>
-                            <div class="sub-branches" id="{category}-details">
-            """
-            
-            # 해당 카테고리의 청크들을 추가 (중복 제거된)
-            for i, item in enumerate(items[:8]):  # 각 카테고리당 최대 8개로 제한
-                chunk = item["chunk"]
-                similarity = item["similarity"]
-                section = chunk.metadata.get("section", "N/A")
-                content = chunk.content[:150] + "..." if len(chunk.content) > 150 else chunk.content
-                
-                # HTML 이스케이프 처리
-                section_escaped = html.escape(section)
-                content_escaped = html.escape(content)
-                
-                html_content += f"""
-                                <div class="detail-node">{section_escaped}</div>
-                                <div class="detail-node">{content_escaped}</div>
-                                <div class="similarity-score">유사도: {similarity:.2f}</div>
-                """
-                
-                # 리소스가 있으면 추가 (링크 처리 개선)
-                resources = chunk.metadata.get("resources", [])
-                if resources:
-                    for resource in resources[:3]:  # 최대 3개 리소스
-                        if isinstance(resource, dict):
-                            title = resource.get("title", "리소스")
-                            url = resource.get("url", "#")
-                            # URL 유효성 검사
-                            if url and url != "#" and (url.startswith("http://") or url.startswith("https://")):
-                                title_escaped = html.escape(title)
-                                url_escaped = html.escape(url)
-                                html_content += f'<div class="resource-node">🔗 <a href="{url_escaped}" target="_blank" rel="noopener noreferrer">{title_escaped}</a></div>'
-                            else:
-                                title_escaped = html.escape(title)
-                                html_content += f'<div class="resource-node">📚 {title_escaped}</div>'
-                        else:
-                            # 문자열인 경우
-                            resource_text = html.escape(str(resource))
-                            html_content += f'<div class="resource-node">📚 {resource_text}</div>'
-                
-                # 도구 정보 추가
-                tools = chunk.metadata.get("tools", [])
-                if tools:
-                    tools_text = ", ".join(tools[:3])  # 최대 3개 도구
-                    tools_escaped = html.escape(tools_text)
-                    html_content += f'<div class="detail-node">🔧 도구: {tools_escaped}</div>'
-                
-                # 학습 목표 추가
-                learning_objectives = chunk.metadata.get("learning_objectives", [])
-                if learning_objectives:
-                    for objective in learning_objectives[:2]:  # 최대 2개 목표
-                        objective_escaped = html.escape(objective)
-                        html_content += f'<div class="detail-node">🎯 {objective_escaped}</div>'
-            
-            html_content += """
-                            </div>
-                        </div>
-                    </div>
-            """
-    
-    html_content += """
-                </div>
-            </div>
-        </div>
+            }
+        </style>"""
 
-        <script>
+_MINDMAP_SCRIPT = """<script>
             let mainBranchesVisible = false;
 
+            // getElementsByClassName은 단일 클래스 조회에서 querySelectorAll보다
+            // 훨씬 싸고 live collection이라 한 번만 받아두면 재조회가 필요 없다.
+            // 열린 헤더만 담기므로 전체 접기가 열린 노드 수에만 비례한다.
+            const _expandedEls = document.getElementsByClassName('expanded');
+
             function toggleAllBranches() {
                 const mainBranches = document.getElementById('mainBranches');
                 mainBranchesVisible = !mainBranchesVisible;
                 mainBranches.style.display = mainBranchesVisible ? 'flex' : 'none';
             }
 
-            function toggleBranch(branchId) {
-                const branch = document.getElementById(branchId);
-                const icon = event.currentTarget.querySelector('.expand-icon');
-                
-                if (branch.style.display === 'none' || branch.style.display === '') {
-                    branch.style.display = 'block';
-                    branch.classList.add('expanded');
-                    icon.classList.add('rotated');
-                    icon.innerHTML = '▼';
-                } else {
-                    branch.style.display = 'none';
-                    branch.classList.remove('expanded');
-                    icon.classList.remove('rotated');
-                    icon.innerHTML = '▶';
+            // 전체 펼침 모드에서 개별 가지를 닫으려면 먼저 컨테이너 클래스를
+            // 헤더별 클래스로 풀어낸다 — expandAll 직후 첫 개별 클릭에서만 실행
+            function materializeAllExpanded() {
+                const mainBranches = document.getElementById('mainBranches');
+                if (!mainBranches || !mainBranches.classList.contains('all-expanded')) return;
+                mainBranches.classList.remove('all-expanded');
+                document.querySelectorAll('[data-branch-id]')
+                    .forEach(h => h.classList.add('expanded'));
+            }
+
+            // 접힌 하위 목록은 <template>(inert fragment)에 담겨 있어 스타일/
+            // 레이아웃 계산에서 완전히 빠진다. 처음 열 때 실제 DOM으로 옮긴다.
+            function inflate(header) {
+                const list = header.nextElementSibling;
+                if (!list || !list.classList.contains('sub-branches')) return;
+                const tpl = list.firstElementChild;
+                if (tpl && tpl.matches('template.lazy')) {
+                    list.appendChild(tpl.content);
+                    tpl.remove();
                 }
             }
 
-            function toggleSubBranch(subBranchId) {
-                const subBranch = document.getElementById(subBranchId);
-                const icon = event.currentTarget.querySelector('.expand-icon');
-                
-                if (subBranch.style.display === 'none' || subBranch.style.display === '') {
-                    subBranch.style.display = 'block';
-                    subBranch.classList.add('expanded');
-                    icon.classList.add('rotated');
-                    icon.innerHTML = '▼';
-                } else {
-                    subBranch.style.display = 'none';
-                    subBranch.classList.remove('expanded');
-                    icon.classList.remove('rotated');
-                    icon.innerHTML = '▶';
+            function inflateAll() {
+                // 중첩 template은 부모가 옮겨진 뒤에야 드러나므로 없어질 때까지 반복
+                let tpl;
+                while ((tpl = document.querySelector('template.lazy'))) {
+                    tpl.parentNode.appendChild(tpl.content);
+                    tpl.remove();
                 }
             }
 
+            function toggle(header) {
+                materializeAllExpanded();
+                if (!header.classList.contains('expanded')) inflate(header);
+                // 하위 목록 표시/아이콘 회전/글리프 모두 CSS가 이 클래스에서
+                // 유도하므로 토글당 DOM 쓰기는 이 한 번뿐이다
+                header.classList.toggle('expanded');
+            }
+
+            // 노드마다 onclick 핸들러를 붙이는 대신 위임 리스너 하나로 처리
+            document.addEventListener('click', (e) => {
+                const header = e.target.closest('[data-branch-id]');
+                if (header) {
+                    toggle(header);
+                    return;
+                }
+                if (e.target.closest('#mindmapRoot')) {
+                    toggleAllBranches();
+                }
+            });
+
             function expandAll() {
                 const mainBranches = document.getElementById('mainBranches');
                 mainBranches.style.display = 'flex';
                 mainBranchesVisible = true;
 
-                const allBranches = document.querySelectorAll('.sub-branches');
-                const allIcons = document.querySelectorAll('.expand-icon');
-                
-                allBranches.forEach(branch => {
-                    branch.style.display = 'block';
-                    branch.classList.add('expanded');
-                });
-                
-                allIcons.forEach(icon => {
-                    icon.classList.add('rotated');
-                    icon.innerHTML = '▼';
-                });
+                // 전부 보여야 하므로 지연 template을 먼저 모두 실체화한다
+                inflateAll();
+                // 가지 수와 무관하게 클래스 한 번만 추가 — 나머지는 CSS가 처리
+                mainBranches.classList.add('all-expanded');
             }
 
             function collapseAll() {
@@ -1317,331 +1663,459 @@ def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDoc
                 mainBranches.style.display = 'none';
                 mainBranchesVisible = false;
 
-                const allBranches = document.querySelectorAll('.sub-branches');
-                const allIcons = document.querySelectorAll('.expand-icon');
-                
-                allBranches.forEach(branch => {
-                    branch.style.display = 'none';
-                    branch.classList.remove('expanded');
-                });
-                
-                allIcons.forEach(icon => {
-                    icon.classList.remove('rotated');
-                    icon.innerHTML = '▶';
-                });
+                mainBranches.classList.remove('all-expanded');
+                // 개별로 열린 헤더 정리 — live collection이라 클래스를 지우면
+                // 앞에서부터 줄어든다. 컨테이너가 이미 숨겨진 뒤라 레이아웃
+                // 플러시는 한 번으로 끝난다
+                while (_expandedEls.length) _expandedEls[0].classList.remove('expanded');
             }
-        </script>
-    </body>
-    </html>
+        </script>"""
+
+# MinHash 시그니처 — sklearn이 없는 환경에서 코퍼스가 아주 커지면 정확한
+# Jaccard 대신 시그니처 일치 비율로 근사한다 (청크당 비교가 내용 길이와
+# 무관한 상수 시간 numpy 연산이 된다). 시그니처는 같은 프로세스 안에서만
+# 비교하므로 salt가 섞이는 내장 hash()를 기반 해시로 써도 안전하다.
+_MINHASH_PERMS = 128
+_MINHASH_MIN_CHUNKS = 2000  # 이보다 작은 코퍼스는 정확한 Jaccard가 더 싸다
+_minhash_rng = np.random.default_rng(0x9E3779B9)
+_MINHASH_A = _minhash_rng.integers(1, 2**63, size=_MINHASH_PERMS, dtype=np.uint64) | np.uint64(1)
+_MINHASH_B = _minhash_rng.integers(0, 2**63, size=_MINHASH_PERMS, dtype=np.uint64)
+
+def _minhash_signature(tokens) -> Optional[np.ndarray]:
+    """토큰 집합의 uint64 MinHash 시그니처를 반환합니다 (빈 집합은 None)."""
+    if not tokens:
+        return None
+    base = np.fromiter((hash(t) & 0xFFFFFFFFFFFFFFFF for t in tokens),
+                       dtype=np.uint64, count=len(tokens))
+    # (a*x + b) mod 2^64 — uint64 오버플로 랩이 곧 mod 연산이다
+    return (base[:, None] * _MINHASH_A + _MINHASH_B).min(axis=0)
+
+# 검색용 인버티드 인덱스는 st.session_state에 보관한다 — Streamlit은
+# 리런마다 스크립트를 새 __main__ 모듈로 실행하므로 모듈 전역 dict는
+# 매 리런 비워져 한 번도 적중하지 못한다. 세션 상태는 리런을 넘어
+# 유지되고 세션별로 격리된다. 버전은 문서 추가/태그 변경 시
+# _bump_corpus_version()으로 올린다.
+_SEARCH_INDEX_STATE_KEY = "_search_index_cache"
+
+def _bump_corpus_version() -> None:
+    """문서/태그 변경 시 호출 — 검색 인덱스와 결과 캐시를 무효화합니다."""
+    st.session_state.corpus_version = st.session_state.get("corpus_version", 0) + 1
+
+def _corpus_key() -> tuple:
+    """(세션 ID, 코퍼스 버전) 쌍을 반환합니다.
+
+    corpus_version은 세션마다 0부터 시작하는 카운터라 단독으로는 프로세스
+    전역 캐시(st.cache_data)의 키가 될 수 없다 — 같은 버전 번호의 다른
+    세션이 서로의 결과를 받게 된다. 세션 고유 ID를 섞어 이를 막는다.
     """
-    
-    return html_content
+    return (st.session_state.get("session_id", ""),
+            st.session_state.get("corpus_version", 0))
 
-def generate_mindmap_html(roadmap_data: Dict[str, Any]) -> str:
-    """로드맵 데이터를 기반으로 인터랙티브 마인드맵 HTML을 생성합니다."""
-    # 메인 토픽
-    main_topic = html.escape(roadmap_data.get('main_topic', '학습 로드맵'))
-    
-    # 사전 요구사항
-    prerequisites_html = ""
-    if roadmap_data.get('prerequisites'):
-        prerequisites_list = ""
-        for req in roadmap_data['prerequisites']:
-            prerequisites_list += f'<div class="detail-node">{html.escape(req)}</div>'
-        prerequisites_html = f"""
-        <div class="branch">
-            <div class="level-node beginner" onclick="toggleBranch('prerequisites')">
-                사전 요구사항 <span class="expand-icon">▶</span>
-            </div>
-            <div class="sub-branches" id="prerequisites">
-                <div class="sub-node" onclick="toggleSubBranch('prerequisites-details')">
-                    필수 선수 지식 <span class="expand-icon">▶</span>
-                </div>
-                <div class="sub-branches" id="prerequisites-details">
-                    {prerequisites_list}
-                </div>
-            </div>
-        </div>
-        """
-    
-    # 단계별 내용
-    phases_html = ""
-    for i, phase in enumerate(roadmap_data.get('phases', [])):
-        phase_title = html.escape(phase.get('title', f'단계 {i+1}'))
-        duration = html.escape(phase.get('duration', ''))
-        
-        topics_html = ""
-        for j, topic in enumerate(phase.get('topics', [])):
-            topic_title = html.escape(topic.get('title', ''))
-            topic_desc = html.escape(topic.get('description', ''))
-            
-            # 학습 링크 처리
-            learning_links_html = ""
-            if topic.get('learning_links'):
-                for link in topic['learning_links']:
-                    link_title = html.escape(link.get('title', '학습 링크'))
-                    link_url = html.escape(link.get('url', '#'))
-                    learning_links_html += f'<div class="resource-node">🔗 <a href="{link_url}" target="_blank">{link_title}</a></div>'
-            
-            topics_html += f"""
-            <div class="detail-node">{topic_title}</div>
-            <div class="detail-node">{topic_desc}</div>
-            {learning_links_html}
-            """
-        
-        # 단계별 클래스 결정
-        phase_class = "beginner" if i == 0 else "intermediate" if i == 1 else "advanced"
-        
-        phases_html += f"""
-        <div class="branch">
-            <div class="level-node {phase_class}" onclick="toggleBranch('phase-{i}')">
-                {phase_title} {f'({duration})' if duration else ''} <span class="expand-icon">▶</span>
-            </div>
-            <div class="sub-branches" id="phase-{i}">
-                <div class="sub-node" onclick="toggleSubBranch('topics-{i}')">
-                    학습 주제 <span class="expand-icon">▶</span>
-                </div>
-                <div class="sub-branches" id="topics-{i}">
-                    {topics_html}
-                </div>
-            </div>
-        </div>
-        """
-    
-    # 추천 자료
-    resources_html = ""
-    if roadmap_data.get('resources'):
-        resources_list = ""
-        for res in roadmap_data['resources']:
-            resources_list += f'<div class="resource-node">📚 {html.escape(res)}</div>'
-        resources_html = f"""
-        <div class="branch">
-            <div class="level-node community" onclick="toggleBranch('resources')">
-                추천 학습 자료 <span class="expand-icon">▶</span>
-            </div>
-            <div class="sub-branches" id="resources">
-                {resources_list}
-            </div>
-        </div>
-        """
-    
-    # HTML 템플릿 (인터랙티브 마인드맵)
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="ko">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{main_topic} - 인터랙티브 마인드맵</title>
-        <style>
-            body {{
-                margin: 0;
-                padding: 20px;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                overflow-x: auto;
-            }}
-
-            .mindmap-container {{
-                background: rgba(255, 255, 255, 0.95);
-                border-radius: 15px;
-                padding: 30px;
-                box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-                min-width: 1200px;
-            }}
+def _get_search_index(roadmap_documents: Dict[str, RoadmapDocument]) -> Dict[str, Any]:
+    """토큰/태그 → 청크 ID 인버티드 인덱스를 반환합니다.
 
-            .mindmap-title {{
-                text-align: center;
-                font-size: 2.5em;
-                font-weight: bold;
-                color: #2c3e50;
-                margin-bottom: 30px;
-                text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
-            }}
-
-            .mindmap {{
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                gap: 30px;
-            }}
-
-            .root-node {{
-                background: linear-gradient(135deg, #FF6B6B, #FF8E53);
-                color: white;
-                padding: 20px 40px;
-                border-radius: 25px;
-                font-size: 1.8em;
-                font-weight: bold;
-                box-shadow: 0 10px 25px rgba(255, 107, 107, 0.3);
-                cursor: pointer;
-                transition: all 0.3s ease;
-            }}
-
-            .root-node:hover {{
-                transform: translateY(-5px);
-                box-shadow: 0 15px 35px rgba(255, 107, 107, 0.4);
-            }}
-
-            .main-branches {{
-                display: flex;
-                justify-content: space-around;
-                width: 100%;
-                gap: 30px;
-                flex-wrap: wrap;
-            }}
-
-            .branch {{
-                flex: 1;
-                min-width: 350px;
-                max-width: 400px;
-            }}
-
-            .level-node {{
-                padding: 15px 25px;
-                border-radius: 20px;
-                font-weight: bold;
-                cursor: pointer;
-                transition: all 0.3s ease;
-                margin-bottom: 15px;
-                text-align: center;
-                box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            }}
+    전체 청크를 매 검색마다 훑는 대신, 쿼리 토큰을 포함한 청크만
+    후보로 뽑기 위한 인덱스. 코퍼스가 바뀌지 않는 한 재구축하지 않는다.
+    """
+    version = st.session_state.get("corpus_version", 0)
+    cache = st.session_state.get(_SEARCH_INDEX_STATE_KEY)
+    if cache is not None and cache["version"] == version:
+        return cache
+
+    token_index = defaultdict(set)  # 소문자 토큰 -> 청크 ID 집합
+    tag_index = defaultdict(set)    # 소문자 태그 -> 청크 ID 집합
+    entries = {}                    # 청크 ID -> (청크, 문서 제목)
+    for document in roadmap_documents.values():
+        for chunk in document.chunks:
+            entries[chunk.id] = (chunk, document.title)
+            for token in _chunk_tokens(chunk):
+                token_index[token].add(chunk.id)
+            for tag in chunk.collection_tags:
+                tag_index[tag.lower()].add(chunk.id)
+            for tag in chunk.search_tags:
+                tag_index[tag.lower()].add(chunk.id)
+
+    # TF-IDF 행렬 (sklearn이 있을 때) — 행 순서는 chunk_ids와 정렬됨
+    chunk_ids = list(entries)
+    vectorizer = tfidf_matrix = None
+    if TfidfVectorizer is not None and chunk_ids:
+        try:
+            vectorizer = TfidfVectorizer(lowercase=True, token_pattern=r'\S+')
+            tfidf_matrix = vectorizer.fit_transform(
+                entries[chunk_id][0].content for chunk_id in chunk_ids)
+        except ValueError:
+            # 유효 토큰이 전혀 없는 코퍼스 — Jaccard 폴백 경로를 쓴다
+            vectorizer = tfidf_matrix = None
+
+    # sklearn이 없고 코퍼스가 충분히 클 때만 MinHash 시그니처 행렬 구축
+    sig_matrix = None
+    if vectorizer is None and len(chunk_ids) >= _MINHASH_MIN_CHUNKS:
+        empty_sig = np.full(_MINHASH_PERMS, np.iinfo(np.uint64).max, dtype=np.uint64)
+        sig_matrix = np.stack([
+            sig if (sig := _minhash_signature(_chunk_tokens(entries[chunk_id][0]))) is not None
+            else empty_sig
+            for chunk_id in chunk_ids
+        ])
+
+    cache = dict(version=version, token_index=token_index,
+                 tag_index=tag_index, entries=entries, chunk_ids=chunk_ids,
+                 vectorizer=vectorizer, tfidf_matrix=tfidf_matrix,
+                 sig_matrix=sig_matrix)
+    st.session_state[_SEARCH_INDEX_STATE_KEY] = cache
+    return cache
+
+# 검색 결과 HTML 캐시 — 같은 (쿼리, 임계값) 재검색은 조회로 끝낸다.
+# 모듈 전역 LRU는 리런마다 초기화되어 적중할 수 없으므로 리런을 넘어
+# 유지되는 st.cache_data를 쓴다. 저장소가 프로세스 전역이므로 키에
+# _corpus_key()(세션 ID + 버전)를 넣어 문서/태그 변경 시 미스가 나고
+# 다른 세션의 결과 페이지가 반환되지 않게 한다. 문서 인자는 언더스코어
+# 접두사로 해시에서 제외 — 코퍼스 정체성은 corpus_key가 대신한다.
+@st.cache_data(show_spinner=False, max_entries=128)
+def _cached_search_html(query: str, threshold: float, corpus_key: tuple,
+                        _roadmap_documents: Dict[str, RoadmapDocument]) -> str:
+    return _search_and_generate_html_impl(query, _roadmap_documents, threshold)
 
-            .beginner {{
-                background: linear-gradient(135deg, #4ECDC4, #44A08D);
-                color: white;
-            }}
+def search_and_generate_html(query: str, roadmap_documents: Dict[str, RoadmapDocument], threshold: float = 0.1) -> str:
+    """검색어 기반으로 관련 청크를 찾아 인터랙티브 마인드맵 HTML을 재생성합니다."""
+    return _cached_search_html(query, threshold, _corpus_key(), roadmap_documents)
 
-            .intermediate {{
-                background: linear-gradient(135deg, #FDBB2D, #22C1C3);
-                color: white;
-            }}
+def _search_and_generate_html_impl(query: str, roadmap_documents: Dict[str, RoadmapDocument], threshold: float = 0.1) -> str:
+    # 청크 ID → 최고 점수 항목. 스코어링 한 패스 안에서 중복까지 흡수하므로
+    # 후보가 어느 경로에서 오든 별도 dedup 단계가 필요 없다.
+    best: Dict[str, Dict[str, Any]] = {}
 
-            .advanced {{
-                background: linear-gradient(135deg, #FA8072, #FF6347);
-                color: white;
-            }}
+    # 파일명으로 검색하는 경우 특별 처리
+    is_filename_search = query.startswith("filename:") or query.startswith("source:")
 
-            .community {{
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-            }}
+    # 쿼리는 루프 밖에서 1회만 토큰화
+    query_tokens = _token_set(query)
+
+    # 인버티드 인덱스로 쿼리와 토큰/태그를 공유하는 청크만 후보로 스코어링
+    index = _get_search_index(roadmap_documents)
+    entries = index["entries"]
+
+    if is_filename_search:
+        # 파일명 검색인 경우 태그 기반으로 검색
+        query_lower = query.lower()
+        for chunk_id in index["tag_index"].get(query_lower, ()):
+            chunk, document_title = entries[chunk_id]
+            tags_exact, tags_lower = _chunk_tag_sets(chunk)
+            if query in tags_exact:
+                similarity = 1.0  # 완전 일치
+            elif query_lower in tags_lower:
+                similarity = 0.8  # 대소문자 무시 일치
+            else:
+                similarity = 0.0  # 인덱스가 한 버전 뒤처진 경우의 방어
+            if similarity >= threshold:
+                prev = best.get(chunk_id)
+                if prev is None or similarity > prev["similarity"]:
+                    best[chunk_id] = {
+                        "chunk": chunk,
+                        "similarity": similarity,
+                        "document_title": document_title
+                    }
+    elif index["vectorizer"] is not None:
+        # TF-IDF 코사인 — 전 청크 스코어를 희소 행렬 곱 1회로 계산
+        query_vec = index["vectorizer"].transform([query])
+        scores = (index["tfidf_matrix"] @ query_vec.T).toarray().ravel()
+        chunk_ids = index["chunk_ids"]
+        for i in np.nonzero(scores >= threshold)[0]:
+            chunk, document_title = entries[chunk_ids[i]]
+            best[chunk_ids[i]] = {
+                "chunk": chunk,
+                "similarity": float(scores[i]),
+                "document_title": document_title
+            }
+    elif index["sig_matrix"] is not None and query_tokens:
+        # 대형 코퍼스 폴백 — MinHash 시그니처 일치 비율로 Jaccard 근사
+        query_sig = _minhash_signature(query_tokens)
+        estimates = (index["sig_matrix"] == query_sig[None, :]).mean(axis=1)
+        chunk_ids = index["chunk_ids"]
+        for i in np.nonzero(estimates >= threshold)[0]:
+            chunk, document_title = entries[chunk_ids[i]]
+            best[chunk_ids[i]] = {
+                "chunk": chunk,
+                "similarity": float(estimates[i]),
+                "document_title": document_title
+            }
+    else:
+        # 일반 텍스트 검색 — 쿼리 토큰을 하나라도 포함한 청크만 대상
+        token_index = index["token_index"]
+        candidate_ids = set()
+        for token in query_tokens:
+            candidate_ids |= token_index.get(token, frozenset())
+        for chunk_id in candidate_ids:
+            chunk, document_title = entries[chunk_id]
+            similarity = calculate_similarity(query_tokens, _chunk_tokens(chunk))
+            if similarity >= threshold:
+                prev = best.get(chunk_id)
+                if prev is None or similarity > prev["similarity"]:
+                    best[chunk_id] = {
+                        "chunk": chunk,
+                        "similarity": similarity,
+                        "document_title": document_title
+                    }
+    
+    # 상위 20개만 힙으로 선별 — 전체 정렬(N log N) 대신 N log 20
+    unique_chunks_list = heapq.nlargest(20, best.values(), key=lambda x: x["similarity"])
+
+    if not unique_chunks_list:
+        return "<h1>검색 결과가 없습니다</h1>"
 
-            .level-node:hover {{
-                transform: translateY(-3px);
-                box-shadow: 0 8px 25px rgba(0, 0, 0, 0.2);
-            }}
+    # 카테고리별로 그룹화
+    categories = {
+        "beginner": [],
+        "intermediate": [],
+        "advanced": [],
+        "community": []
+    }
+    
+    for item in unique_chunks_list:
+        category = _chunk_category(item["chunk"])
+        target = categories[category] if category in _BRANCH_CATEGORIES else categories["community"]
+        target.append(item)
+    
+    # 소스 문서 수는 템플릿 밖에서 1회만 집계
+    source_doc_count = len({item["chunk"].roadmap_id for item in unique_chunks_list})
+
+    # HTML 템플릿 (인터랙티브 마인드맵) — 정적 블록은 모듈 상수 재사용.
+    # 출력은 C 레벨 가변 버퍼인 StringIO에 바로 쓴다. 루프 안 속성 조회를
+    # 아끼려고 write를 지역 변수로 호이스팅.
+    buf = io.StringIO()
+    w = buf.write
+    w(f"""
+    <!DOCTYPE html>
+    <html lang="ko">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{query} - 검색 결과 기반 학습 로드맵</title>
+        """)
+    w(_MINDMAP_STYLE)
+    w(f"""
+    </head>
+    <body>
+        <div class="mindmap-container">
+            <h1 class="mindmap-title">{query} 학습 로드맵</h1>
+            
+            <div class="search-info">
+                🔍 검색어: <strong>{query}</strong> | 📊 검색 결과: <strong>{len(unique_chunks_list)}개</strong> | 
+                📚 소스 문서: <strong>{source_doc_count}개</strong>
+            </div>
 
-            .sub-branches {{
-                margin-left: 20px;
-                margin-top: 15px;
-                display: none;
-            }}
+            <div class="controls">
+                <button class="btn" onclick="expandAll()">전체 펼치기</button>
+                <button class="btn" onclick="collapseAll()">전체 접기</button>
+            </div>
 
-            .sub-branches.expanded {{
-                display: block;
-                animation: slideDown 0.3s ease-out;
-            }}
+            <div class="mindmap">
+                <div class="root-node" id="mindmapRoot">
+                    {query} 학습 로드맵
+                </div>
 
-            @keyframes slideDown {{
-                from {{
-                    opacity: 0;
-                    max-height: 0;
-                }}
-                to {{
-                    opacity: 1;
-                    max-height: 1000px;
-                }}
-            }}
+                <div class="main-branches" id="mainBranches" style="display: none;">
+    """)
+    
+    # 카테고리별로 브랜치 생성
+    category_names = {
+        "beginner": "초급 (Beginner)",
+        "intermediate": "중급 (Intermediate)", 
+        "advanced": "고급 (Advanced)",
+        "community": "커뮤니티 (Community)"
+    }
+    
+    for category, items in categories.items():
+        if items:  # 해당 카테고리에 항목이 있는 경우만
+            # 접힌 하위 목록은 <template>(inert fragment) 안에 담아 두고
+            # 처음 펼칠 때 JS가 실제 DOM으로 옮긴다 — 초기 렌더링 비용 절감
+            w(f"""
+                    <div class="branch">
+                        <div class="level-node {category}" data-branch-id="{category}">
+                            {category_names[category]} <span class="expand-icon"></span>
+                        </div>
+                        <div class="sub-branches" id="{category}"><template class="lazy">
+                            <div class="sub-node" data-branch-id="{category}-details">
+                                검색 결과 <span class="expand-icon"></span>
+                            </div>
+                            <div class="sub-branches" id="{category}-details"><template class="lazy">
+            """)
+            
+            # 해당 카테고리의 청크들을 추가 (중복 제거된)
+            for i, item in enumerate(items[:8]):  # 각 카테고리당 최대 8개로 제한
+                chunk = item["chunk"]
+                similarity = item["similarity"]
+                meta = chunk.metadata  # dict 조회는 1회만
+
+                # 섹션명/미리보기는 이스케이프까지 마친 결과를 청크에 캐시
+                section_escaped = chunk.section_escaped
+                if section_escaped is None:
+                    section_escaped = _esc(meta.get("section", "N/A"))
+                    chunk.section_escaped = section_escaped
+                preview_escaped = chunk.preview_escaped
+                if preview_escaped is None:
+                    content = chunk.content
+                    preview_escaped = _esc(content[:150] + "..." if len(content) > 150 else content)
+                    chunk.preview_escaped = preview_escaped
+
+                w(_DETAIL_TMPL.format(s=section_escaped))
+                w(_DETAIL_TMPL.format(s=preview_escaped))
+                w(_SIMILARITY_TMPL.format(s=similarity))
 
-            .sub-node {{
-                background: rgba(255, 255, 255, 0.9);
-                border-left: 4px solid #3498db;
-                padding: 12px 20px;
-                margin: 8px 0;
-                border-radius: 8px;
-                font-size: 0.95em;
-                box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);
-                cursor: pointer;
-                transition: all 0.2s ease;
-            }}
+                # 리소스가 있으면 추가 (링크 처리 개선)
+                resources = meta.get("resources", [])
+                if resources:
+                    for resource in resources[:3]:  # 최대 3개 리소스
+                        if isinstance(resource, dict):
+                            title = resource.get("title", "리소스")
+                            url = resource.get("url", "#")
+                            # URL 유효성 검사
+                            if url and url != "#" and url.startswith(_VALID_SCHEMES):
+                                w(_RESOURCE_LINK_TMPL.format(url=_esc(url), title=_esc(title)))
+                            else:
+                                w(_RESOURCE_TEXT_TMPL.format(s=_esc(title)))
+                        else:
+                            # 문자열인 경우
+                            w(_RESOURCE_TEXT_TMPL.format(s=_esc(str(resource))))
 
-            .sub-node:hover {{
-                background: rgba(52, 152, 219, 0.1);
-                transform: translateX(5px);
-            }}
+                # 도구 정보 추가
+                tools = meta.get("tools", [])
+                if tools:
+                    tools_text = ", ".join(tools[:3])  # 최대 3개 도구
+                    w(_TOOLS_TMPL.format(s=_esc(tools_text)))
 
-            .detail-node {{
-                background: rgba(255, 255, 255, 0.7);
-                border-left: 3px solid #95a5a6;
-                padding: 8px 15px;
-                margin: 5px 0 5px 20px;
-                border-radius: 5px;
-                font-size: 0.85em;
-                color: #2c3e50;
-            }}
+                # 학습 목표 추가
+                learning_objectives = meta.get("learning_objectives", [])
+                if learning_objectives:
+                    for objective in learning_objectives[:2]:  # 최대 2개 목표
+                        w(_OBJECTIVE_TMPL.format(s=_esc(objective)))
+            
+            w("""
+                            </template></div>
+                        </template></div>
+                    </div>
+            """)
 
-            .resource-node {{
-                background: rgba(46, 204, 113, 0.1);
-                border-left: 3px solid #2ecc71;
-                padding: 8px 15px;
-                margin: 5px 0 5px 20px;
-                border-radius: 5px;
-                font-size: 0.85em;
-                color: #27ae60;
-            }}
+    w("""
+                </div>
+            </div>
+        </div>
+    """)
+    w(_MINDMAP_SCRIPT)
+    w("""
+    </body>
+    </html>
+    """)
 
-            .resource-node a {{
-                color: #2980b9;
-                text-decoration: underline;
-                font-weight: 500;
-                transition: all 0.2s ease;
-                padding: 2px 4px;
-                border-radius: 3px;
-                background: rgba(41, 128, 185, 0.1);
-            }}
+    return buf.getvalue()
 
-            .resource-node a:hover {{
-                color: #ffffff;
-                background: #3498db;
-                text-decoration: none;
-                transform: translateX(3px);
-                box-shadow: 0 2px 8px rgba(52, 152, 219, 0.3);
-            }}
+def _render_topic(topic: Dict[str, Any]) -> str:
+    """주제 하나의 HTML 조각을 렌더링합니다."""
+    learning_links_html = "".join(
+        _RESOURCE_LINK_TMPL.format(url=_esc(link.get("url", "#")),
+                                   title=_esc(link.get("title", "학습 링크")))
+        for link in topic.get('learning_links') or ()
+    )
+    return f"""
+            <div class="detail-node">{_esc(topic.get('title', ''))}</div>
+            <div class="detail-node">{_esc(topic.get('description', ''))}</div>
+            {learning_links_html}
+            """
 
-            .expand-icon {{
-                float: right;
-                transition: transform 0.3s ease;
-            }}
+def _render_phase(phase: Dict[str, Any], i: int) -> str:
+    """단계 하나의 브랜치 HTML을 렌더링합니다."""
+    phase_title = _esc(phase.get('title', f'단계 {i+1}'))
+    duration = _esc(phase.get('duration', ''))
 
-            .expand-icon.rotated {{
-                transform: rotate(90deg);
-            }}
+    topics_html = "".join(
+        _render_topic(topic) for topic in phase.get('topics', [])
+    )
 
-            .controls {{
-                text-align: center;
-                margin-bottom: 20px;
-            }}
+    # 단계별 클래스 결정
+    phase_class = "beginner" if i == 0 else "intermediate" if i == 1 else "advanced"
 
-            .btn {{
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 25px;
-                cursor: pointer;
-                margin: 0 10px;
-                font-size: 0.9em;
-                transition: all 0.3s ease;
-            }}
+    return f"""
+        <div class="branch">
+            <div class="level-node {phase_class}" data-branch-id="phase-{i}">
+                {phase_title} {f'({duration})' if duration else ''} <span class="expand-icon"></span>
+            </div>
+            <div class="sub-branches" id="phase-{i}"><template class="lazy">
+                <div class="sub-node" data-branch-id="topics-{i}">
+                    학습 주제 <span class="expand-icon"></span>
+                </div>
+                <div class="sub-branches" id="topics-{i}"><template class="lazy">
+                    {topics_html}
+                </template></div>
+            </template></div>
+        </div>
+        """
 
-            .btn:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-            }}
-        </style>
+def generate_mindmap_html(roadmap_data: Dict[str, Any]) -> str:
+    """로드맵 데이터를 기반으로 인터랙티브 마인드맵 HTML을 생성합니다."""
+    # 메인 토픽
+    main_topic = _esc(roadmap_data.get('main_topic', '학습 로드맵'))
+    
+    # 사전 요구사항
+    prerequisites_html = ""
+    if roadmap_data.get('prerequisites'):
+        prerequisites_list = "".join(
+            _DETAIL_TMPL.format(s=_esc(req))
+            for req in roadmap_data['prerequisites']
+        )
+        prerequisites_html = f"""
+        <div class="branch">
+            <div class="level-node beginner" data-branch-id="prerequisites">
+                사전 요구사항 <span class="expand-icon"></span>
+            </div>
+            <div class="sub-branches" id="prerequisites"><template class="lazy">
+                <div class="sub-node" data-branch-id="prerequisites-details">
+                    필수 선수 지식 <span class="expand-icon"></span>
+                </div>
+                <div class="sub-branches" id="prerequisites-details"><template class="lazy">
+                    {prerequisites_list}
+                </template></div>
+            </template></div>
+        </div>
+        """
+    
+    # 단계별 내용 — 문서 전체 재사용은 _cached_mindmap_html이 맡으므로
+    # 단계/주제 단위에는 별도 캐시 계층을 두지 않는다 (모듈 수명 캐시는
+    # 리런마다 비워져 직렬화 키 비용만 남는다)
+    phases_html = "".join(
+        _render_phase(phase, i)
+        for i, phase in enumerate(roadmap_data.get('phases', []))
+    )
+
+    # 추천 자료
+    resources_html = ""
+    if roadmap_data.get('resources'):
+        resources_list = "".join(
+            _RESOURCE_TEXT_TMPL.format(s=_esc(res))
+            for res in roadmap_data['resources']
+        )
+        resources_html = f"""
+        <div class="branch">
+            <div class="level-node community" data-branch-id="resources">
+                추천 학습 자료 <span class="expand-icon"></span>
+            </div>
+            <div class="sub-branches" id="resources"><template class="lazy">
+                {resources_list}
+            </template></div>
+        </div>
+        """
+    
+    # HTML 템플릿 (인터랙티브 마인드맵) — 정적 블록은 모듈 상수 재사용,
+    # 전체 조립은 StringIO 버퍼 1개로
+    buf = io.StringIO()
+    buf.write(f"""
+    <!DOCTYPE html>
+    <html lang="ko">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{main_topic} - 인터랙티브 마인드맵</title>
+        """)
+    buf.write(_MINDMAP_STYLE)
+    buf.write(f"""
     </head>
     <body>
         <div class="mindmap-container">
@@ -1653,7 +2127,7 @@ def generate_mindmap_html(roadmap_data: Dict[str, Any]) -> str:
             </div>
 
             <div class="mindmap">
-                <div class="root-node" onclick="toggleAllBranches()">
+                <div class="root-node" id="mindmapRoot">
                     {main_topic}
                 </div>
 
@@ -1664,93 +2138,179 @@ def generate_mindmap_html(roadmap_data: Dict[str, Any]) -> str:
                 </div>
             </div>
         </div>
-
-        <script>
-            let mainBranchesVisible = false;
-
-            function toggleAllBranches() {{
-                const mainBranches = document.getElementById('mainBranches');
-                mainBranchesVisible = !mainBranchesVisible;
-                mainBranches.style.display = mainBranchesVisible ? 'flex' : 'none';
-            }}
-
-            function toggleBranch(branchId) {{
-                const branch = document.getElementById(branchId);
-                const icon = event.currentTarget.querySelector('.expand-icon');
-                
-                if (branch.style.display === 'none' || branch.style.display === '') {{
-                    branch.style.display = 'block';
-                    branch.classList.add('expanded');
-                    icon.classList.add('rotated');
-                    icon.innerHTML = '▼';
-                }} else {{
-                    branch.style.display = 'none';
-                    branch.classList.remove('expanded');
-                    icon.classList.remove('rotated');
-                    icon.innerHTML = '▶';
-                }}
-            }}
-
-            function toggleSubBranch(subBranchId) {{
-                const subBranch = document.getElementById(subBranchId);
-                const icon = event.currentTarget.querySelector('.expand-icon');
-                
-                if (subBranch.style.display === 'none' || subBranch.style.display === '') {{
-                    subBranch.style.display = 'block';
-                    subBranch.classList.add('expanded');
-                    icon.classList.add('rotated');
-                    icon.innerHTML = '▼';
-                }} else {{
-                    subBranch.style.display = 'none';
-                    subBranch.classList.remove('expanded');
-                    icon.classList.remove('rotated');
-                    icon.innerHTML = '▶';
-                }}
-            }}
-
-            function expandAll() {{
-                const mainBranches = document.getElementById('mainBranches');
-                mainBranches.style.display = 'flex';
-                mainBranchesVisible = true;
-
-                const allBranches = document.querySelectorAll('.sub-branches');
-                const allIcons = document.querySelectorAll('.expand-icon');
-                
-                allBranches.forEach(branch => {{
-                    branch.style.display = 'block';
-                    branch.classList.add('expanded');
-                }});
-                
-                allIcons.forEach(icon => {{
-                    icon.classList.add('rotated');
-                    icon.innerHTML = '▼';
-                }});
-            }}
-
-            function collapseAll() {{
-                const mainBranches = document.getElementById('mainBranches');
-                mainBranches.style.display = 'none';
-                mainBranchesVisible = false;
-
-                const allBranches = document.querySelectorAll('.sub-branches');
-                const allIcons = document.querySelectorAll('.expand-icon');
-                
-                allBranches.forEach(branch => {{
-                    branch.style.display = 'none';
-                    branch.classList.remove('expanded');
-                }});
-                
-                allIcons.forEach(icon => {{
-                    icon.classList.remove('rotated');
-                    icon.innerHTML = '▶';
-                }});
-            }}
-        </script>
+        """)
+    buf.write(_MINDMAP_SCRIPT)
+    buf.write("""
     </body>
     </html>
-    """
-    
-    return html_content
+    """)
+
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_mindmap_html(roadmap_data: Dict[str, Any]) -> str:
+    """같은 roadmap_data에 대한 마인드맵 HTML을 리런 간 재사용합니다.
+
+    st.cache_data가 dict 인자를 직접 해시하므로 별도 직렬화 키가 필요 없다.
+    반환값은 불변 문자열이라 캐시 히트 경로가 사실상 공짜다."""
+    return generate_mindmap_html(roadmap_data)
+
+# 로드맵 생성 프롬프트 — 임포트 시 한 번만 구성한다. Template은 $topic만
+# 치환하므로 JSON 스키마의 중괄호를 f-string처럼 이중으로 이스케이프할
+# 필요가 없다 (호출마다 문자열 스캔/이스케이프 비용도 사라진다).
+_ROADMAP_PROMPT_T = Template("""
+주제 "$topic"에 대한 체계적인 학습 로드맵을 생성해주세요.
+
+다음 JSON 형식으로 응답해주세요:
+{
+    "main_topic": "주제명",
+    "prerequisites": ["사전 요구사항1", "사전 요구사항2"],
+    "phases": [
+        {
+            "title": "단계명",
+            "duration": "예상 소요시간",
+            "topics": [
+                {
+                    "title": "세부 주제명",
+                    "description": "세부 주제 설명",
+                    "learning_links": [
+                        {
+                            "title": "관련 학습 링크 제목",
+                            "url": "https://example.com/learning-resource"
+                        }
+                    ]
+                }
+            ]
+        }
+    ],
+    "resources": ["추천 자료1", "추천 자료2"]
+}
+
+각 단계는 논리적 순서로 배치하고, 초보자부터 고급자까지 단계적으로 학습할 수 있도록 구성해주세요.
+각 주제마다 관련된 유용한 학습 링크(온라인 강의, 문서, 튜토리얼 등)를 포함해주세요.
+""")
+
+# API 실패 시 돌려주는 기본 로드맵 골격 — 호출마다 20여 개의 dict/list
+# 리터럴을 다시 조립하는 대신 골격을 복사하고 topic만 치환한다
+_FALLBACK_ROADMAP_SKELETON = {
+    "main_topic": None,
+    "prerequisites": ["기본적인 학습 의지", "꾸준한 학습 시간 확보"],
+    "phases": [
+        {
+            "title": "기초 단계",
+            "duration": "2-4주",
+            "topics": [
+                {"title": "기본 개념 이해", "description": "{topic}의 기본 개념을 학습합니다."},
+                {"title": "핵심 원리 파악", "description": "{topic}의 핵심 원리를 이해합니다."}
+            ]
+        },
+        {
+            "title": "중급 단계",
+            "duration": "4-8주",
+            "topics": [
+                {"title": "실습 및 적용", "description": "{topic}을 실제로 적용해봅니다."},
+                {"title": "문제 해결", "description": "{topic} 관련 문제를 해결하는 방법을 학습합니다."}
+            ]
+        },
+        {
+            "title": "고급 단계",
+            "duration": "8-12주",
+            "topics": [
+                {"title": "심화 학습", "description": "{topic}의 고급 개념을 학습합니다."},
+                {"title": "프로젝트 수행", "description": "{topic}을 활용한 실제 프로젝트를 수행합니다."}
+            ]
+        }
+    ],
+    "resources": ["온라인 강의", "관련 서적", "실습 자료", "커뮤니티 참여"]
+}
+
+def _fallback_roadmap(topic: str) -> Dict[str, Any]:
+    """기본 로드맵 반환 — 골격을 deepcopy한 뒤 topic만 채운다.
+
+    반환값은 세션에 저장/수정될 수 있으므로 읽기 전용 뷰가 아니라
+    독립 사본을 돌려준다."""
+    fb = copy.deepcopy(_FALLBACK_ROADMAP_SKELETON)
+    fb["main_topic"] = topic
+    for phase in fb["phases"]:
+        for t in phase["topics"]:
+            t["description"] = t["description"].format(topic=topic)
+    return fb
+
+@st.cache_resource(show_spinner=False)
+def _openai_client(api_key: str):
+    """API 키당 OpenAI 클라이언트를 하나만 유지합니다.
+
+    커넥션 풀과 TLS 핸드셰이크를 호출/리런 간 재사용한다 — 생성 요청마다
+    새 httpx.Client를 만들고 닫으면 핸드셰이크 비용이 매번 든다.
+    수명은 st.cache_resource가 관리하므로 호출부에서 닫지 않는다."""
+    import httpx
+    import openai
+    # 프록시 설정 없이 httpx 클라이언트 생성 (timeout 증가)
+    return openai.OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(
+            timeout=httpx.Timeout(120.0),  # 2분으로 증가
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+        ),
+    )
+
+# 대시보드 통계 차트 — 입력이 하드코딩 상수라 figure를 최초 1회만 만들고
+# 이후 리런에서는 캐시에서 꺼낸다 (Plotly figure 조립은 공짜가 아니다)
+@st.cache_data(show_spinner=False)
+def _monthly_trend_fig():
+    import plotly.express as px  # 차트 렌더링 시에만 로드
+    chart_data = pd.DataFrame({
+        "월": ["1월", "2월", "3월", "4월", "5월"],
+        "생성 수": [5, 8, 12, 15, 24]
+    })
+    return px.line(chart_data, x="월", y="생성 수", title="월별 로드맵 생성 추이")
+
+@st.cache_data(show_spinner=False)
+def _subject_dist_fig():
+    import plotly.express as px
+    subject_data = pd.DataFrame({
+        "주제": ["React", "Python", "JavaScript", "Java", "기타"],
+        "개수": [8, 6, 4, 3, 3]
+    })
+    return px.pie(subject_data, values="개수", names="주제", title="주제별 로드맵 분포")
+
+@st.cache_data(show_spinner=False)
+def _change_trend_fig():
+    import plotly.express as px
+    # 시간별 데이터 생성 (시뮬레이션)
+    time_data = pd.DataFrame({
+        "시간": pd.date_range(start='2024-01-01', periods=30, freq='D'),
+        "변경수": [2, 3, 1, 4, 2, 3, 5, 2, 1, 3, 4, 2, 6, 3, 2, 1, 4, 3, 2, 5, 3, 2, 1, 4, 3, 2, 5, 3, 2, 1]
+    })
+    return px.line(time_data, x="시간", y="변경수", title="일별 변경 로그 추이")
+
+# 로드맵 하위 구조 해시-콘싱 테이블 — 같은 phases/topics 서브트리를
+# 세션에 한 번만 유지한다 (로드맵 간 중복이 많을수록 메모리 절감).
+# 테이블은 st.session_state에 둔다 — 모듈 전역은 리런마다 새 __main__과
+# 함께 초기화되어 생성이 리런당 하나뿐인 이 앱에서는 로드맵 간 공유가
+# 한 번도 일어나지 않는다. st.session_state.roadmaps와 수명도 일치한다.
+_INTERN_TABLE_STATE_KEY = "_intern_table"
+
+def _intern_tree(obj):
+    """dict/list 서브트리를 내용 기준으로 인턴합니다.
+
+    같은 내용이면 같은 객체를 돌려주므로 중복 서브트리는 포인터 공유로만
+    존재한다. 이 워크플로에서 로드맵 데이터는 저장 후 수정되지 않는다."""
+    table = st.session_state.setdefault(_INTERN_TABLE_STATE_KEY, {})
+    return _intern_into(table, obj)
+
+def _intern_into(table: Dict[str, Any], obj):
+    if isinstance(obj, dict):
+        obj = {key: _intern_into(table, value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        obj = [_intern_into(table, value) for value in obj]
+    else:
+        return obj
+    key = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+    canonical = table.get(key)
+    if canonical is None:
+        table[key] = canonical = obj
+    return canonical
 
 # 헤더
 st.markdown("""
@@ -1815,21 +2375,11 @@ if page == "메인 대시보드":
     
     with col1:
         # 월별 로드맵 생성 추이
-        chart_data = pd.DataFrame({
-            "월": ["1월", "2월", "3월", "4월", "5월"],
-            "생성 수": [5, 8, 12, 15, 24]
-        })
-        fig = px.line(chart_data, x="월", y="생성 수", title="월별 로드맵 생성 추이")
-        st.plotly_chart(fig, use_container_width=True)
-    
+        st.plotly_chart(_monthly_trend_fig(), use_container_width=True)
+
     with col2:
         # 주제별 분포
-        subject_data = pd.DataFrame({
-            "주제": ["React", "Python", "JavaScript", "Java", "기타"],
-            "개수": [8, 6, 4, 3, 3]
-        })
-        fig = px.pie(subject_data, values="개수", names="주제", title="주제별 로드맵 분포")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_subject_dist_fig(), use_container_width=True)
 
 # 로드맵 생성/조회
 elif page == "로드맵 생성/조회":
@@ -1873,12 +2423,12 @@ elif page == "로드맵 생성/조회":
         with col2:
             st.subheader("🚀 로드맵 생성")
             
-            # 설정 상태 확인
-            if not st.session_state.get("openai_api_key"):
+            # 설정 상태 확인 (col1에서 읽어둔 로컬 재사용 — 세션 프록시 재조회 없음)
+            if not api_key:
                 st.warning("⚠️ 사이드바에서 OpenAI API 키를 먼저 입력해주세요")
-            
+
             st.markdown("<br>", unsafe_allow_html=True)
-            generate_button = st.button("🚀 로드맵 생성", type="primary", disabled=not st.session_state.get("openai_api_key"))
+            generate_button = st.button("🚀 로드맵 생성", type="primary", disabled=not api_key)
         
         # 로드맵 생성
         if generate_button:
@@ -1904,57 +2454,19 @@ elif page == "로드맵 생성/조회":
                                 
                                 status_text.text("API 연결 중...")
                                 progress_bar.progress(25)
-                                # httpx 클라이언트를 직접 설정하여 프록시 문제 해결
-                                import httpx
-                                
-                                # 프록시 설정 없이 httpx 클라이언트 생성 (timeout 증가)
-                                http_client = httpx.Client(
-                                    timeout=httpx.Timeout(120.0),  # 2분으로 증가
-                                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-                                )
-                                
-                                # OpenAI 클라이언트 생성
-                                client = openai.OpenAI(
-                                    api_key=api_key,
-                                    http_client=http_client
-                                )
+
+                                # API 키당 캐시된 클라이언트 — TCP/TLS 연결을 호출 간 재사용
+                                client = _openai_client(api_key)
                                 
                                 status_text.text("ChatGPT API 호출 중...")
                                 progress_bar.progress(50)
                                 
-                                prompt = f"""
-                                주제 "{topic}"에 대한 체계적인 학습 로드맵을 생성해주세요.
-                                
-                                다음 JSON 형식으로 응답해주세요:
-                                {{
-                                    "main_topic": "주제명",
-                                    "prerequisites": ["사전 요구사항1", "사전 요구사항2"],
-                                    "phases": [
-                                        {{
-                                            "title": "단계명",
-                                            "duration": "예상 소요시간",
-                                            "topics": [
-                                                {{
-                                                    "title": "세부 주제명",
-                                                    "description": "세부 주제 설명",
-                                                    "learning_links": [
-                                                        {{
-                                                            "title": "관련 학습 링크 제목",
-                                                            "url": "https://example.com/learning-resource"
-                                                        }}
-                                                    ]
-                                                }}
-                                            ]
-                                        }}
-                                    ],
-                                    "resources": ["추천 자료1", "추천 자료2"]
-                                }}
-                                
-                                각 단계는 논리적 순서로 배치하고, 초보자부터 고급자까지 단계적으로 학습할 수 있도록 구성해주세요.
-                                각 주제마다 관련된 유용한 학습 링크(온라인 강의, 문서, 튜토리얼 등)를 포함해주세요.
-                                """
+                                prompt = _ROADMAP_PROMPT_T.substitute(topic=topic)
                                 
-                                response = client.chat.completions.create(
+                                # 전체 완료(수십 초)를 기다리는 대신 스트리밍 수신 —
+                                # 총 소요 시간은 같지만 진행 상황이 바로 보이고,
+                                # 첫 토큰 도착 시점부터 사용자가 대기 상태를 벗어난다
+                                stream = client.chat.completions.create(
                                     model=model,
                                     messages=[
                                         {"role": "system", "content": "당신은 교육 전문가입니다. 주어진 주제에 대해 체계적이고 효과적인 학습 로드맵을 제공합니다."},
@@ -1962,13 +2474,25 @@ elif page == "로드맵 생성/조회":
                                     ],
                                     max_tokens=3000,  # 토큰 수 증가
                                     temperature=0.7,
-                                    timeout=120  # API 호출 timeout 설정
+                                    timeout=120,  # API 호출 timeout 설정
+                                    stream=True
                                 )
-                                
+
+                                buf = io.StringIO()
+                                received = 0
+                                for part in stream:
+                                    delta = part.choices[0].delta.content if part.choices else None
+                                    if delta:
+                                        buf.write(delta)
+                                        received += 1
+                                        # 매 델타마다 갱신하면 프런트 왕복이 낭비 — 간헐 갱신
+                                        if received % 20 == 0:
+                                            status_text.text(f"응답 수신 중... ({received}개 청크)")
+
                                 status_text.text("응답 처리 중...")
                                 progress_bar.progress(75)
-                                
-                                content = response.choices[0].message.content
+
+                                content = buf.getvalue()
                                 
                                 # JSON 파싱 시도
                                 try:
@@ -1978,14 +2502,14 @@ elif page == "로드맵 생성/조회":
                                     elif "```" in content:
                                         content = content.split("```")[1].split("```")[0]
                                     
-                                    roadmap_data = json.loads(content.strip())
+                                    roadmap_data = _json_loads(content.strip())
                                     
                                     status_text.text("로드맵 생성 완료!")
                                     progress_bar.progress(100)
                                     
                                     return roadmap_data
                                     
-                                except json.JSONDecodeError:
+                                except ValueError:  # json/orjson 공통 디코드 오류
                                     # JSON 파싱 실패 시 기본 구조 생성
                                     status_text.text("JSON 파싱 실패, 기본 구조 생성 중...")
                                     progress_bar.progress(90)
@@ -2010,59 +2534,24 @@ elif page == "로드맵 생성/조회":
                                 progress_bar.progress(0)
                                 status_text.text("오류 발생")
                                 
-                                st.error(f"API 호출 중 오류가 발생했습니다: {str(e)}")
-                                # 오류 상세 정보 표시
-                                st.error(f"오류 타입: {type(e).__name__}")
-                                st.error(f"오류 메시지: {str(e)}")
-                                
+                                # 메시지마다 프런트 왕복이 발생하므로 한 번에 모아서 표시
+                                err_text = str(e)
+                                st.error(f"API 호출 중 오류가 발생했습니다 ({type(e).__name__}): {err_text}")
+
                                 # timeout 관련 안내
-                                if "timeout" in str(e).lower() or "timed out" in str(e).lower():
-                                    st.warning("⚠️ 시간 초과가 발생했습니다. 다음을 시도해보세요:")
-                                    st.markdown("""
-                                    - 네트워크 연결 상태를 확인하세요
-                                    - 더 간단한 주제로 다시 시도해보세요
-                                    - 잠시 후 다시 시도해보세요
-                                    - 다른 ChatGPT 모델을 선택해보세요
-                                    """)
+                                if "timeout" in err_text.lower() or "timed out" in err_text.lower():
+                                    st.warning(
+                                        "⚠️ 시간 초과가 발생했습니다. 다음을 시도해보세요:\n"
+                                        "- 네트워크 연결 상태를 확인하세요\n"
+                                        "- 더 간단한 주제로 다시 시도해보세요\n"
+                                        "- 잠시 후 다시 시도해보세요\n"
+                                        "- 다른 ChatGPT 모델을 선택해보세요"
+                                    )
                                 
                                 # 대안: 기본 로드맵 생성
                                 st.warning("기본 로드맵을 생성합니다.")
-                                return {
-                                    "main_topic": topic,
-                                    "prerequisites": ["기본적인 학습 의지", "꾸준한 학습 시간 확보"],
-                                    "phases": [
-                                        {
-                                            "title": "기초 단계",
-                                            "duration": "2-4주",
-                                            "topics": [
-                                                {"title": "기본 개념 이해", "description": f"{topic}의 기본 개념을 학습합니다."},
-                                                {"title": "핵심 원리 파악", "description": f"{topic}의 핵심 원리를 이해합니다."}
-                                            ]
-                                        },
-                                        {
-                                            "title": "중급 단계",
-                                            "duration": "4-8주",
-                                            "topics": [
-                                                {"title": "실습 및 적용", "description": f"{topic}을 실제로 적용해봅니다."},
-                                                {"title": "문제 해결", "description": f"{topic} 관련 문제를 해결하는 방법을 학습합니다."}
-                                            ]
-                                        },
-                                        {
-                                            "title": "고급 단계",
-                                            "duration": "8-12주",
-                                            "topics": [
-                                                {"title": "심화 학습", "description": f"{topic}의 고급 개념을 학습합니다."},
-                                                {"title": "프로젝트 수행", "description": f"{topic}을 활용한 실제 프로젝트를 수행합니다."}
-                                            ]
-                                        }
-                                    ],
-                                    "resources": ["온라인 강의", "관련 서적", "실습 자료", "커뮤니티 참여"]
-                                }
+                                return _fallback_roadmap(topic)
                             finally:
-                                # httpx 클라이언트 정리
-                                if 'http_client' in locals():
-                                    http_client.close()
-                                
                                 # 진행 상황 정리
                                 if 'progress_bar' in locals():
                                     progress_bar.empty()
@@ -2078,7 +2567,7 @@ elif page == "로드맵 생성/조회":
                             st.success("로드맵이 성공적으로 생성되었습니다!")
                             
                             # 마인드맵 HTML 생성
-                            mindmap_html = generate_mindmap_html(roadmap_data)
+                            mindmap_html = _cached_mindmap_html(roadmap_data)
                             
                             # HTML 표시
                             st.components.v1.html(mindmap_html, height=800, scrolling=True)
@@ -2094,7 +2583,9 @@ elif page == "로드맵 생성/조회":
                             
                             # 원본 데이터 표시 (선택사항)
                             with st.expander("📄 원본 데이터 보기"):
-                                st.json(roadmap_data)
+                                # 미리 직렬화한 문자열을 넘겨 Streamlit 내부
+                                # json.dumps 패스를 건너뛴다
+                                st.json(_json_pretty(roadmap_data))
                             
                             # 세션에 저장
                             new_roadmap = {
@@ -2102,7 +2593,7 @@ elif page == "로드맵 생성/조회":
                                 "난이도": "AI 생성",
                                 "중점분야": "AI 기반",
                                 "생성시간": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                "데이터": roadmap_data
+                                "데이터": _intern_tree(roadmap_data)  # 중복 서브트리 공유
                             }
                             st.session_state.roadmaps.append(new_roadmap)
                             
@@ -2113,16 +2604,11 @@ elif page == "로드맵 생성/조회":
         st.subheader("📚 생성된 로드맵 조회")
         
         if st.session_state.roadmaps:
-            # 로드맵 목록 표시
-            roadmaps_df = pd.DataFrame([
-                {
-                    "주제": roadmap["주제"],
-                    "난이도": roadmap["난이도"],
-                    "중점분야": roadmap["중점분야"],
-                    "생성시간": roadmap["생성시간"]
-                }
+            # 로드맵 목록 표시 (목록이 안 바뀌면 캐시 히트)
+            roadmaps_df = _roadmaps_summary_df(tuple(
+                (roadmap["주제"], roadmap["난이도"], roadmap["중점분야"], roadmap["생성시간"])
                 for roadmap in st.session_state.roadmaps
-            ])
+            ))
             st.dataframe(roadmaps_df, use_container_width=True)
             
             # 상세 조회
@@ -2149,9 +2635,13 @@ elif page == "로드맵 생성/조회":
                     if "데이터" in selected_roadmap:
                         st.subheader("🗺️ 로드맵 미리보기")
                         roadmap_data = selected_roadmap["데이터"]
-                        
-                        # 마인드맵 HTML 재생성
-                        mindmap_html = generate_mindmap_html(roadmap_data)
+
+                        # 렌더링된 HTML을 로드맵 레코드에 붙여두면 선택만 바꾸는
+                        # 리런에서 데이터 dict 해시조차 생략된다 ("데이터"는 생성
+                        # 이후 변경되지 않으므로 무효화가 필요 없다)
+                        mindmap_html = selected_roadmap.setdefault(
+                            "_html", _cached_mindmap_html(roadmap_data)
+                        )
                         st.components.v1.html(mindmap_html, height=600, scrolling=True)
                         
                         # 다운로드 버튼
@@ -2248,11 +2738,21 @@ elif page == "HTML 업로드/파싱":
                 st.session_state.uploaded_filenames.append(filename)
 
             # 파싱 및 Qdrant 적재 버튼
+            force_reparse = st.checkbox(
+                "🔄 동일 파일 강제 재파싱",
+                value=False,
+                help="같은 HTML을 다시 눌러도 Qdrant 재적재를 건너뛰는 것을 무시합니다"
+            )
             if st.button("🔍 파싱 및 Qdrant 적재"):
                 with st.spinner("파싱 및 Qdrant 적재 중..."):
                     try:
-                        # 새로운 파싱 로직 사용
-                        roadmap_id = f"roadmap_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                        # 해시는 여기서 1회만 계산해 문서 생성/재적재 게이트에 재사용
+                        html_digest = hashlib.sha256(html_content.encode()).hexdigest()
+
+                        # 새로운 파싱 로직 사용 — ID를 내용 해시에서 파생해
+                        # 같은 업로드의 재파싱이 parse_html_sections 캐시에
+                        # 적중하도록 한다 (시각 기반 ID는 매번 키가 달라짐)
+                        roadmap_id = f"roadmap_{html_digest[:16]}"
                         
                         # 메타데이터 추출
                         metadata = extract_roadmap_metadata(html_content)
@@ -2264,8 +2764,9 @@ elif page == "HTML 업로드/파싱":
                         # HTML 기본 정보 표시
                         st.write(f"**HTML 크기:** {len(html_content)} bytes")
                         
-                        # HTML 구조 미리보기
-                        soup = BeautifulSoup(html_content, 'html.parser')
+                        # HTML 구조 미리보기 (_parse_document와 동일하게 C 파서 사용)
+                        from bs4 import BeautifulSoup
+                        soup = BeautifulSoup(html_content, 'lxml')
                         title_elem = soup.find(['h1', 'title'])
                         if title_elem:
                             st.write(f"**제목:** {title_elem.get_text().strip()}")
@@ -2278,36 +2779,37 @@ elif page == "HTML 업로드/파싱":
                             st.warning("⚠️ 파싱된 청크가 없습니다. HTML 구조를 확인해주세요.")
                             st.write("**HTML 구조 분석:**")
                             
-                            # HTML 구조 디버깅
-                            soup = BeautifulSoup(html_content, 'html.parser')
-                            
+                            # 구조 디버깅 — 제목 미리보기에서 만든 soup 재사용
+                            # (같은 html_content를 세 번째로 파싱하지 않는다)
+
                             # 주요 태그 찾기
                             st.write("**발견된 주요 태그:**")
                             main_tags = soup.find_all(['div', 'section', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                            tag_info = []
+                            # 행별 dict 대신 컬럼별 리스트로 쌓으면 pandas의
+                            # 타입 추론 패스와 행당 dict 해싱이 사라진다
+                            tag_names, tag_classes, tag_texts = [], [], []
                             for tag in main_tags[:10]:  # 상위 10개만
-                                classes = ' '.join(tag.get('class', []))
-                                tag_info.append({
-                                    "태그": tag.name,
-                                    "클래스": classes,
-                                    "텍스트": tag.get_text().strip()[:50] + "..." if len(tag.get_text().strip()) > 50 else tag.get_text().strip()
-                                })
-                            st.dataframe(pd.DataFrame(tag_info), use_container_width=True)
-                            
-                            # 클래스별 분포
-                            all_classes = []
-                            for tag in soup.find_all():
-                                all_classes.extend(tag.get('class', []))
-                            
-                            class_counts = {}
-                            for cls in all_classes:
-                                class_counts[cls] = class_counts.get(cls, 0) + 1
+                                text = tag.get_text().strip()
+                                tag_names.append(tag.name)
+                                tag_classes.append(' '.join(tag.get('class', [])))
+                                tag_texts.append(text[:50] + "..." if len(text) > 50 else text)
+                            st.dataframe(
+                                pd.DataFrame({"태그": tag_names, "클래스": tag_classes, "텍스트": tag_texts}),
+                                use_container_width=True,
+                            )
                             
+                            # 클래스별 분포 — class 속성이 있는 태그만 한 번에
+                            # 순회하며 C 구현 Counter로 집계한다
+                            class_counts = Counter(
+                                cls
+                                for tag in soup.find_all(class_=True)
+                                for cls in tag['class']
+                            )
+
                             if class_counts:
                                 st.write("**클래스별 분포 (상위 10개):**")
-                                sorted_classes = sorted(class_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-                                for cls, count in sorted_classes:
-                                    st.write(f"• {cls}: {count}회")
+                                # 행마다 st.write 하나는 행마다 프런트 메시지 하나 — 표 1회로 렌더
+                                st.table(pd.DataFrame(class_counts.most_common(10), columns=["클래스", "횟수"]))
                         else:
                             # 파일명 태그를 모든 청크에 추가
                             for chunk in chunks:
@@ -2325,56 +2827,34 @@ elif page == "HTML 업로드/파싱":
                             document = RoadmapDocument(
                                 id=roadmap_id,
                                 title=title,
-                                original_html=html_content,
+                                original_html_hash=html_digest,
+                                original_html_size=len(html_content),
                                 chunks=chunks,
                                 metadata=metadata
                             )
                             
                             # 세션에 저장
                             st.session_state.roadmap_documents[roadmap_id] = document
+                            _bump_corpus_version()
                             
                             parsing_status.success(f"✅ 파싱 결과: 성공! (청크 수: {len(chunks)})")
                             
-                            # 파싱 통계
+                            # 파싱 통계 (리런 간 캐시된 집계 사용)
                             st.write("**📊 파싱 통계:**")
-                            type_counts = {}
-                            category_counts = {}
-                            for chunk in chunks:
-                                chunk_type = chunk.metadata.get("type", "unknown")
-                                type_counts[chunk_type] = type_counts.get(chunk_type, 0) + 1
-                                
-                                category = chunk.metadata.get("category", "unknown")
-                                category_counts[category] = category_counts.get(category, 0) + 1
-                            
+                            parse_stats = _parse_stats(chunks)
+
                             col_stat1, col_stat2 = st.columns(2)
                             with col_stat1:
                                 st.write("**타입별 분포:**")
-                                for chunk_type, count in type_counts.items():
-                                    st.write(f"• {chunk_type}: {count}개")
-                            
+                                st.table(pd.DataFrame(list(parse_stats["types"].items()), columns=["타입", "개수"]))
+
                             with col_stat2:
                                 st.write("**카테고리별 분포:**")
-                                for category, count in category_counts.items():
-                                    st.write(f"• {category}: {count}개")
+                                st.table(pd.DataFrame(list(parse_stats["categories"].items()), columns=["카테고리", "개수"]))
                             
                             # 미리보기
                             st.write("**파싱된 청크 일부 미리보기:**")
-                            preview_data = []
-                            for chunk in chunks[:5]:  # 상위 5개만 표시
-                                preview_data.append({
-                                    "ID": chunk.id,
-                                    "섹션": chunk.metadata.get("section", "N/A"),
-                                    "타입": chunk.metadata.get("type", "N/A"),
-                                    "레벨": chunk.metadata.get("level", "N/A"),
-                                    "카테고리": chunk.metadata.get("category", "N/A"),
-                                    "키워드": ", ".join(chunk.metadata.get("keywords", [])[:3]),
-                                    "도구": ", ".join(chunk.metadata.get("tools", [])[:2]),
-                                    "수집 태그": ", ".join(chunk.collection_tags[:3]),
-                                    "검색 태그": ", ".join(chunk.search_tags[:3]),
-                                    "내용 길이": len(chunk.content),
-                                    "내용 미리보기": chunk.content[:100] + "..." if len(chunk.content) > 100 else chunk.content
-                                })
-                            st.dataframe(pd.DataFrame(preview_data), use_container_width=True)
+                            st.dataframe(chunks_to_df(chunks).head(5), use_container_width=True)
                             
                             # 상세 미리보기 (첫 번째 청크)
                             if chunks:
@@ -2411,14 +2891,12 @@ elif page == "HTML 업로드/파싱":
                                 with col_tag1:
                                     st.write("**📦 수집 태그 (상위 10개):**")
                                     collection_sorted = sorted(tag_stats["collection_tags"].items(), key=lambda x: x[1], reverse=True)[:10]
-                                    for tag, count in collection_sorted:
-                                        st.write(f"• {tag}: {count}회")
-                                
+                                    st.table(pd.DataFrame(collection_sorted, columns=["태그", "횟수"]))
+
                                 with col_tag2:
                                     st.write("**🔍 검색 태그 (상위 10개):**")
                                     search_sorted = sorted(tag_stats["search_tags"].items(), key=lambda x: x[1], reverse=True)[:10]
-                                    for tag, count in search_sorted:
-                                        st.write(f"• {tag}: {count}회")
+                                    st.table(pd.DataFrame(search_sorted, columns=["태그", "횟수"]))
                             
                             # 개별 청크 태그 편집
                             st.write("**✏️ 청크별 태그 편집:**")
@@ -2483,6 +2961,7 @@ elif page == "HTML 업로드/파싱":
                                         # 문서 업데이트
                                         document.chunks = chunks
                                         st.session_state.roadmap_documents[roadmap_id] = document
+                                        _bump_corpus_version()
                                         
                                         st.success(f"✅ 태그가 적용되었습니다! (수집: {len(new_collection_tags)}개, 검색: {len(new_search_tags)}개)")
                                         
@@ -2520,15 +2999,13 @@ elif page == "HTML 업로드/파싱":
                                     new_search_tags = [tag.strip().lower() for tag in bulk_search_tags.split(",") if tag.strip()]
                                 
                                 if new_collection_tags or new_search_tags:
-                                    # 모든 청크에 태그 적용
-                                    updated_chunks = []
-                                    for chunk in chunks:
-                                        updated_chunk = apply_tags_to_chunk(chunk, new_collection_tags, new_search_tags)
-                                        updated_chunks.append(updated_chunk)
-                                    
+                                    # 모든 청크에 태그 적용 (객체 재생성 없이 제자리 병합)
+                                    _merge_tags_inplace(chunks, new_collection_tags, new_search_tags)
+
                                     # 문서 업데이트
-                                    document.chunks = updated_chunks
+                                    document.chunks = chunks
                                     st.session_state.roadmap_documents[roadmap_id] = document
+                                    _bump_corpus_version()
                                     
                                     st.success(f"✅ 일괄 태그가 적용되었습니다! ({len(chunks)}개 청크)")
                             
@@ -2572,110 +3049,112 @@ elif page == "HTML 업로드/파싱":
                                             "타입": chunk.metadata.get("type", "N/A"),
                                             "수집 태그": ", ".join(chunk.collection_tags[:3]),
                                             "검색 태그": ", ".join(chunk.search_tags[:3]),
-                                            "내용 미리보기": chunk.content[:100] + "..." if len(chunk.content) > 100 else chunk.content
+                                            "내용 미리보기": _chunk_preview100(chunk)
                                         })
                                     st.dataframe(pd.DataFrame(search_results), use_container_width=True)
                                 else:
                                     st.info("검색 조건에 맞는 청크가 없습니다.")
                         
-                                                # 기존 파싱 로직도 유지 (호환성)
-                        try:
-                            from react_roadmap_parser import ReactRoadmapParser, QdrantRoadmapStore
-                            from db_validation_logger import DatabaseValidationLogger
-                            validation_logger = DatabaseValidationLogger("validation_logs.db")
-                            parser = ReactRoadmapParser(html_content, validation_logger)
-                            nodes = parser.parse()
+                        # 기존 파싱 로직도 유지 (호환성)
+                        # 같은 HTML을 이미 적재했다면 파서→임베딩→업서트 전체를 생략
+                        if st.session_state.get("last_qdrant_html_hash") == html_digest and not force_reparse:
+                            st.info("동일한 HTML이 이미 Qdrant에 적재되어 있어 재적재를 건너뜁니다.")
+                        else:
+                            try:
+                                from react_roadmap_parser import ReactRoadmapParser, QdrantRoadmapStore
+                                from db_validation_logger import DatabaseValidationLogger
+                                validation_logger = DatabaseValidationLogger("validation_logs.db")
+                                parser = ReactRoadmapParser(html_content, validation_logger)
+                                nodes = parser.parse()
                             
-                            # 파일명 태깅
-                            for n in nodes:
-                                if hasattr(n, 'tags') and isinstance(n.tags, list):
-                                    n.tags.append(f"source:{filename}")
-                                    n.tags.append(f"filename:{filename}")
-                                if hasattr(n, 'links') and isinstance(n.links, list):
-                                    for link in n.links:
-                                        if isinstance(link, dict):
-                                            link['source'] = filename
+                                # 파일명 태깅
+                                for n in nodes:
+                                    if hasattr(n, 'tags') and isinstance(n.tags, list):
+                                        n.tags.append(f"source:{filename}")
+                                        n.tags.append(f"filename:{filename}")
+                                    if hasattr(n, 'links') and isinstance(n.links, list):
+                                        for link in n.links:
+                                            if isinstance(link, dict):
+                                                link['source'] = filename
                             
-                            # Qdrant 적재
-                            store = QdrantRoadmapStore(validation_logger=validation_logger)
-                            store.initialize_collection(force_recreate=False)
-                            store.store_nodes(nodes)
-                            st.success("Qdrant DB에 적재 완료!")
+                                # Qdrant 적재
+                                store = QdrantRoadmapStore(validation_logger=validation_logger)
+                                store.initialize_collection(force_recreate=False)
+                                store.store_nodes(nodes)
+                                st.success("Qdrant DB에 적재 완료!")
+                                # 적재 성공 시에만 해시를 기록 — 다음 클릭부터 재적재 생략
+                                st.session_state["last_qdrant_html_hash"] = html_digest
                             
-                            # 디비 적재된 데이터 미리보기
-                            st.write("**📊 Qdrant DB 적재된 데이터 미리보기:**")
+                                # 디비 적재된 데이터 미리보기
+                                st.write("**📊 Qdrant DB 적재된 데이터 미리보기:**")
                             
-                            # Collection 정보 확인
-                            collection_info = store.get_collection_info()
-                            if collection_info:
-                                col_db1, col_db2, col_db3 = st.columns(3)
-                                with col_db1:
-                                    st.metric("저장된 포인트", collection_info.get('points_count', 0))
-                                with col_db2:
-                                    st.metric("벡터 수", collection_info.get('vectors_count', 0))
-                                with col_db3:
-                                    st.metric("Collection 상태", "활성화")
+                                # Collection 정보 확인
+                                collection_info = store.get_collection_info()
+                                if collection_info:
+                                    col_db1, col_db2, col_db3 = st.columns(3)
+                                    with col_db1:
+                                        st.metric("저장된 포인트", collection_info.get('points_count', 0))
+                                    with col_db2:
+                                        st.metric("벡터 수", collection_info.get('vectors_count', 0))
+                                    with col_db3:
+                                        st.metric("Collection 상태", "활성화")
                             
-                            # 저장된 노드 샘플 조회
-                            try:
-                                # 카테고리별 노드 수 조회
-                                categories = ['beginner', 'intermediate', 'advanced', 'community']
-                                category_counts = {}
-                                for category in categories:
-                                    category_nodes = store.get_nodes_by_category(category)
-                                    category_counts[category] = len(category_nodes)
-                                
-                                st.write("**📈 카테고리별 노드 분포:**")
-                                category_df = pd.DataFrame([
-                                    {"카테고리": cat, "노드 수": count}
-                                    for cat, count in category_counts.items()
-                                ])
-                                st.dataframe(category_df, use_container_width=True)
-                                
-                                # 최근 저장된 노드 샘플 조회
-                                st.write("**🔍 저장된 노드 샘플:**")
-                                sample_nodes = []
-                                for category in categories:
-                                    nodes = store.get_nodes_by_category(category)
-                                    if nodes:
-                                        sample_nodes.extend(nodes[:2])  # 카테고리당 2개씩
+                                # 저장된 노드 샘플 조회
+                                try:
+                                    # 카테고리별 노드 수 조회 — 서버 측 count만 받는다
+                                    # (전체 페이로드를 긁어와 len()만 취하지 않는다)
+                                    categories = ['beginner', 'intermediate', 'advanced', 'community']
+                                    category_counts = {cat: store.count_by_category(cat) for cat in categories}
+
+                                    st.write("**📈 카테고리별 노드 분포:**")
+                                    category_df = pd.DataFrame([
+                                        {"카테고리": cat, "노드 수": count}
+                                        for cat, count in category_counts.items()
+                                    ])
+                                    st.dataframe(category_df, use_container_width=True)
+
+                                    # 최근 저장된 노드 샘플 조회 (카테고리당 2개, 벡터 제외)
+                                    st.write("**🔍 저장된 노드 샘플:**")
+                                    sample_nodes = []
+                                    for category in categories:
+                                        sample_nodes.extend(store.sample_by_category(category, k=2))
                                         if len(sample_nodes) >= 6:  # 최대 6개
                                             break
                                 
-                                if sample_nodes:
-                                    node_preview_data = []
-                                    for i, node_data in enumerate(sample_nodes[:6]):
-                                        node_preview_data.append({
-                                            "순서": i + 1,
-                                            "제목": node_data.get('title', 'N/A')[:30] + "..." if len(node_data.get('title', '')) > 30 else node_data.get('title', 'N/A'),
-                                            "카테고리": node_data.get('category', 'N/A'),
-                                            "타입": node_data.get('node_type', 'N/A'),
-                                            "태그 수": len(node_data.get('tags', [])),
-                                            "링크 수": len(node_data.get('links', []))
-                                        })
-                                    st.dataframe(pd.DataFrame(node_preview_data), use_container_width=True)
-                                    
-                                    # 첫 번째 노드 상세 정보
                                     if sample_nodes:
-                                        st.write("**📋 첫 번째 노드 상세 정보:**")
-                                        first_node = sample_nodes[0]
-                                        st.json({
-                                            "id": first_node.get('id', 'N/A'),
-                                            "title": first_node.get('title', 'N/A'),
-                                            "category": first_node.get('category', 'N/A'),
-                                            "node_type": first_node.get('node_type', 'N/A'),
-                                            "depth": first_node.get('depth', 'N/A'),
-                                            "tags": first_node.get('tags', []),
-                                            "links": first_node.get('links', [])
-                                        })
-                                else:
-                                    st.info("저장된 노드가 없습니다.")
+                                        node_preview_data = []
+                                        for i, node_data in enumerate(sample_nodes[:6]):
+                                            node_preview_data.append({
+                                                "순서": i + 1,
+                                                "제목": node_data.get('title', 'N/A')[:30] + "..." if len(node_data.get('title', '')) > 30 else node_data.get('title', 'N/A'),
+                                                "카테고리": node_data.get('category', 'N/A'),
+                                                "타입": node_data.get('node_type', 'N/A'),
+                                                "태그 수": len(node_data.get('tags', [])),
+                                                "링크 수": len(node_data.get('links', []))
+                                            })
+                                        st.dataframe(pd.DataFrame(node_preview_data), use_container_width=True)
                                     
-                            except Exception as e:
-                                st.warning(f"데이터 미리보기 중 오류: {str(e)}")
+                                        # 첫 번째 노드 상세 정보
+                                        if sample_nodes:
+                                            st.write("**📋 첫 번째 노드 상세 정보:**")
+                                            first_node = sample_nodes[0]
+                                            st.json({
+                                                "id": first_node.get('id', 'N/A'),
+                                                "title": first_node.get('title', 'N/A'),
+                                                "category": first_node.get('category', 'N/A'),
+                                                "node_type": first_node.get('node_type', 'N/A'),
+                                                "depth": first_node.get('depth', 'N/A'),
+                                                "tags": first_node.get('tags', []),
+                                                "links": first_node.get('links', [])
+                                            })
+                                    else:
+                                        st.info("저장된 노드가 없습니다.")
+                                    
+                                except Exception as e:
+                                    st.warning(f"데이터 미리보기 중 오류: {str(e)}")
                                 
-                        except ImportError:
-                            st.warning("기존 파싱 모듈을 찾을 수 없어 새로운 파싱 방식만 사용합니다.")
+                            except ImportError:
+                                st.warning("기존 파싱 모듈을 찾을 수 없어 새로운 파싱 방식만 사용합니다.")
                         
                     except Exception as e:
                         error_msg = str(e)
@@ -2704,10 +3183,10 @@ elif page == "HTML 업로드/파싱":
                 st.write("**발견된 키워드:**")
                 tags = latest_doc.metadata.get("tags", [])
                 if tags:
-                    tag_cols = st.columns(3)
-                    for i, tag in enumerate(tags[:9]):  # 상위 9개만
-                        col_idx = i % 3
-                        tag_cols[col_idx].write(f"• {tag}")
+                    # 상위 9개를 3×3 표 한 번으로 — 셀마다 위젯 메시지를 보내지 않는다
+                    top_tags = tags[:9]
+                    rows = [top_tags[i:i + 3] for i in range(0, len(top_tags), 3)]
+                    st.table(pd.DataFrame(rows).fillna(""))
                 
                 # 구조 정보
                 col_info1, col_info2 = st.columns(2)
@@ -2716,27 +3195,9 @@ elif page == "HTML 업로드/파싱":
                 with col_info2:
                     st.write(f"**카테고리:** {latest_doc.metadata.get('category', 'programming')}")
                 
-                # 청크별 상세 정보
+                # 청크별 상세 정보 (상위 10개만, 캐시된 헬퍼로 구성)
                 st.write("**청크별 상세 정보:**")
-                chunk_details = []
-                for i, chunk in enumerate(latest_doc.chunks[:10]):  # 상위 10개만
-                    chunk_details.append({
-                        "순서": i + 1,
-                        "ID": chunk.id,
-                        "섹션": chunk.metadata.get("section", "N/A"),
-                        "타입": chunk.metadata.get("type", "N/A"),
-                        "레벨": chunk.metadata.get("level", "N/A"),
-                        "카테고리": chunk.metadata.get("category", "N/A"),
-                        "키워드 수": len(chunk.metadata.get("keywords", [])),
-                        "도구 수": len(chunk.metadata.get("tools", [])),
-                        "리소스 수": len(chunk.metadata.get("resources", [])),
-                        "학습목표 수": len(chunk.metadata.get("learning_objectives", [])),
-                        "수집 태그": ", ".join(chunk.collection_tags[:3]),
-                        "검색 태그": ", ".join(chunk.search_tags[:3]),
-                        "내용 길이": len(chunk.content),
-                        "HTML 길이": len(chunk.html_fragment)
-                    })
-                st.dataframe(pd.DataFrame(chunk_details), use_container_width=True)
+                st.dataframe(_chunk_details_df(latest_doc.chunks[:10]), use_container_width=True)
                 
                 # 태그 통계
                 tag_stats = get_tag_statistics(latest_doc.chunks)
@@ -2747,69 +3208,43 @@ elif page == "HTML 업로드/파싱":
                     with col_tag_stat1:
                         st.write("**📦 수집 태그 (상위 10개):**")
                         collection_sorted = sorted(tag_stats["collection_tags"].items(), key=lambda x: x[1], reverse=True)[:10]
-                        for tag, count in collection_sorted:
-                            st.write(f"• {tag}: {count}회")
-                    
+                        st.table(pd.DataFrame(collection_sorted, columns=["태그", "횟수"]))
+
                     with col_tag_stat2:
                         st.write("**🔍 검색 태그 (상위 10개):**")
                         search_sorted = sorted(tag_stats["search_tags"].items(), key=lambda x: x[1], reverse=True)[:10]
-                        for tag, count in search_sorted:
-                            st.write(f"• {tag}: {count}회")
+                        st.table(pd.DataFrame(search_sorted, columns=["태그", "횟수"]))
                 
                 # 구조화된 정보 요약
                 st.write("**🏗️ 구조화된 정보 요약:**")
                 col_sum1, col_sum2 = st.columns(2)
                 
                 with col_sum1:
-                    # 타입별 분포
-                    type_counts = {}
-                    for chunk in latest_doc.chunks:
-                        chunk_type = chunk.metadata.get("type", "unknown")
-                        type_counts[chunk_type] = type_counts.get(chunk_type, 0) + 1
-                    
+                    # 타입별 분포 (캐시된 집계 재사용)
                     st.write("**타입별 분포:**")
-                    for chunk_type, count in type_counts.items():
-                        st.write(f"• {chunk_type}: {count}개")
-                    
-                    # 도구별 분포
-                    all_tools = []
-                    for chunk in latest_doc.chunks:
-                        all_tools.extend(chunk.metadata.get("tools", []))
-                    
-                    tool_counts = {}
-                    for tool in all_tools:
-                        tool_counts[tool] = tool_counts.get(tool, 0) + 1
-                    
-                    if tool_counts:
+                    st.table(pd.DataFrame(list(_parse_stats(latest_doc.chunks)["types"].items()), columns=["타입", "개수"]))
+
+                    # 도구별 분포 (value_counts는 이미 내림차순 정렬)
+                    doc_stats = _doc_summary_stats(latest_doc.chunks)
+                    tool_counts = doc_stats["tool_counts"]
+                    if not tool_counts.empty:
                         st.write("**🔧 발견된 도구:**")
-                        for tool, count in sorted(tool_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-                            st.write(f"• {tool}: {count}회")
-                
+                        st.table(tool_counts.head(5).rename_axis("도구").reset_index(name="횟수"))
+
                 with col_sum2:
                     # 리소스별 분포
-                    all_resources = []
-                    for chunk in latest_doc.chunks:
-                        all_resources.extend(chunk.metadata.get("resources", []))
-                    
-                    resource_types = {}
-                    for resource in all_resources:
-                        resource_type = resource.get("type", "unknown")
-                        resource_types[resource_type] = resource_types.get(resource_type, 0) + 1
-                    
-                    if resource_types:
+                    resource_type_counts = doc_stats["resource_type_counts"]
+                    if not resource_type_counts.empty:
                         st.write("**📚 리소스 타입별 분포:**")
-                        for res_type, count in sorted(resource_types.items(), key=lambda x: x[1], reverse=True):
-                            st.write(f"• {res_type}: {count}개")
-                    
+                        st.table(resource_type_counts.rename_axis("리소스 타입").reset_index(name="개수"))
+
                     # 학습 목표 요약
-                    all_objectives = []
-                    for chunk in latest_doc.chunks:
-                        all_objectives.extend(chunk.metadata.get("learning_objectives", []))
-                    
+                    all_objectives = doc_stats["objectives"]
                     if all_objectives:
                         st.write("**🎯 학습 목표 (일부):**")
-                        for obj in all_objectives[:3]:
-                            st.write(f"• {obj[:50]}{'...' if len(obj) > 50 else ''}")
+                        st.table(pd.DataFrame(
+                            {"학습 목표": [obj[:50] + ('...' if len(obj) > 50 else '') for obj in all_objectives[:3]]}
+                        ))
                 
                 # 저장 버튼
                 if st.button("💾 Qdrant 저장", key="save_parsed"):
@@ -2824,8 +3259,7 @@ elif page == "HTML 업로드/파싱":
                 
                 # 발견된 주제들
                 st.write("**발견된 주제:**")
-                for topic in parsing_status.data["topics"]:
-                    st.write(f"• {topic}")
+                st.table(pd.DataFrame({"주제": parsing_status.data["topics"]}))
                 
                 # 구조 정보
                 st.write(f"**구조 유형:** {parsing_status.data['structure']}")
@@ -2912,7 +3346,7 @@ elif page == "DB → HTML 재생성":
                 # 2. 계층적 구조로 변환
                 roadmap_data = convert_chunks_to_roadmap_data(matched_chunks, main_topic=query)
                 # 3. 마인드맵 HTML 생성
-                generated_html = generate_mindmap_html(roadmap_data)
+                generated_html = _cached_mindmap_html(roadmap_data)
                 # 결과를 세션 상태에 저장
                 st.session_state.generated_result = {
                     "query": query,
@@ -2980,7 +3414,7 @@ elif page == "DB → HTML 재생성":
             }
             st.download_button(
                 "⬇️ JSON 다운로드", 
-                data=json.dumps(result_data, indent=2), 
+                data=_json_pretty(result_data), 
                 file_name=f"{query}_roadmap.json", 
                 key=f"download_search_json_{query}"
             )
@@ -3114,15 +3548,7 @@ elif page == "변경 로그/이력":
     
     # 시간별 변경 추이
     st.subheader("📊 시간별 변경 추이")
-    
-    # 시간별 데이터 생성 (시뮬레이션)
-    time_data = pd.DataFrame({
-        "시간": pd.date_range(start='2024-01-01', periods=30, freq='D'),
-        "변경수": [2, 3, 1, 4, 2, 3, 5, 2, 1, 3, 4, 2, 6, 3, 2, 1, 4, 3, 2, 5, 3, 2, 1, 4, 3, 2, 5, 3, 2, 1]
-    })
-    
-    fig = px.line(time_data, x="시간", y="변경수", title="일별 변경 로그 추이")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_change_trend_fig(), use_container_width=True)
 
 # 푸터
 st.markdown("---")
@@ -46,7 +46,9 @@ class ReactRoadmapParser:
     """React 로드맵 HTML 파서"""
     
     def __init__(self, html_content: str, validation_logger: Optional[DatabaseValidationLogger] = None):
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        # lxml(C libxml2)은 순수 파이썬 html.parser보다 수 배 빠르고
+        # 노드당 메모리도 적다 — 큰 로드맵 HTML에서 파싱이 지배 비용이다
+        self.soup = BeautifulSoup(html_content, 'lxml')
         self.nodes: List[RoadmapNode] = []
         self.current_order = 0
         self.validation_logger = validation_logger
@@ -465,15 +467,14 @@ class QdrantRoadmapStore:
             return
             
         start_time = datetime.now()
+
+        # 임베딩은 전체를 한 번에 배치 인코딩 — 노드당 encode 호출은
+        # 모델 호출 오버헤드를 N번 지불한다
+        embedding_texts = [self._create_embedding_text(node) for node in nodes]
+        vectors = self.encoder.encode(embedding_texts)
+
         points = []
-        
-        for node in nodes:
-            # 임베딩을 위한 텍스트 생성
-            embedding_text = self._create_embedding_text(node)
-            
-            # 벡터 생성
-            vector = self.encoder.encode(embedding_text).tolist()
-            
+        for node, embedding_text, vector in zip(nodes, embedding_texts, vectors):
             # 페이로드 생성
             payload = {
                 'id': node.id,
@@ -488,18 +489,24 @@ class QdrantRoadmapStore:
                 'tags': node.tags,
                 'embedding_text': embedding_text
             }
-            
+
             points.append(PointStruct(
                 id=node.id,
-                vector=vector,
+                vector=vector.tolist(),
                 payload=payload
             ))
-        
-        # 배치로 저장
-        self.client.upsert(
-            collection_name=self.collection_name,
-            points=points
-        )
+
+        # 256개 슬랩으로 나눠 저장 — 중간 슬랩은 wait=False로 보내
+        # 서버가 이전 슬랩을 색인하는 동안 다음 슬랩이 전송되고,
+        # 마지막 슬랩만 wait=True로 적재 완료를 확정한다. 직후의
+        # count/scroll 프리뷰가 방금 적재한 내용을 보도록 보장.
+        batch_size = 256
+        for i in range(0, len(points), batch_size):
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[i:i + batch_size],
+                wait=i + batch_size >= len(points)
+            )
         
         processing_time = (datetime.now() - start_time).total_seconds()
         logger.info(f"Stored {len(points)} nodes in Qdrant in {processing_time:.2f}s")
@@ -609,6 +616,43 @@ class QdrantRoadmapStore:
             logger.error(f"Error retrieving nodes by category {category}: {e}")
             return []
     
+    def count_by_category(self, category: str) -> int:
+        """카테고리별 노드 수 조회 (서버 측 count — 페이로드 전송 없음)"""
+        try:
+            result = self.client.count(
+                collection_name=self.collection_name,
+                count_filter={
+                    "must": [
+                        {"key": "category", "match": {"value": category}}
+                    ]
+                },
+                exact=True
+            )
+            return result.count
+        except Exception as e:
+            logger.error(f"Error counting nodes by category {category}: {e}")
+            return 0
+
+    def sample_by_category(self, category: str, k: int = 2) -> List[Dict[str, Any]]:
+        """카테고리별 샘플 노드 조회 — k개만, 벡터 제외"""
+        try:
+            scroll_result = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter={
+                    "must": [
+                        {"key": "category", "match": {"value": category}}
+                    ]
+                },
+                limit=k,
+                with_payload=True,
+                with_vectors=False
+            )
+
+            return [point.payload for point in scroll_result[0]]
+        except Exception as e:
+            logger.error(f"Error sampling nodes by category {category}: {e}")
+            return []
+
     def get_children_nodes(self, parent_id: str) -> List[Dict[str, Any]]:
         """부모 ID로 자식 노드들 조회"""
         try: